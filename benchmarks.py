@@ -0,0 +1,293 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Module
+
+Generates large synthetic quests.txt/items.txt files and times the
+game_data loaders against them, and times saving/loading characters in
+each save format. Results are printed (or written) as JSON so runs from
+different commits can be compared.
+
+Usage:
+    python benchmarks.py --sizes 1000 100000 --output bench.json
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import argparse
+import platform
+import tracemalloc
+
+import game_data
+import character_manager
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+DEFAULT_CHAIN_LENGTH = 1000
+DEFAULT_SAVE_COUNT = 1000
+SAVE_FORMATS = {
+    "text": {"save_format": "text"},
+    "binary": {"save_format": "binary"},
+    "binary_zlib": {"save_format": "binary", "compress": True}
+}
+ITEM_STATS = ("health", "max_health", "strength", "magic")
+
+# ============================================================================
+# DATA GENERATION
+# ============================================================================
+
+def write_quests_file(filename, count, chain_length=DEFAULT_CHAIN_LENGTH):
+    """
+    Write count valid quests to filename
+
+    Quests are grouped into prerequisite chains of chain_length, so the
+    last quest of each group has chain_length - 1 prerequisites.
+    """
+    with open(filename, 'w') as f:
+        for number in range(count):
+            if number % chain_length == 0:
+                prerequisite = "NONE"
+            else:
+                prerequisite = f"quest_{number - 1}"
+            f.write(
+                f"QUEST_ID: quest_{number}\n"
+                f"TITLE: Generated Quest {number}\n"
+                f"DESCRIPTION: Synthetic quest number {number} for benchmarking\n"
+                f"REWARD_XP: {50 + number % 500}\n"
+                f"REWARD_GOLD: {25 + number % 250}\n"
+                f"REQUIRED_LEVEL: {1 + (number % chain_length) // 10}\n"
+                f"PREREQUISITE: {prerequisite}\n\n"
+            )
+
+def write_items_file(filename, count):
+    """Write count valid items to filename"""
+    item_types = game_data.VALID_ITEM_TYPES
+    with open(filename, 'w') as f:
+        for number in range(count):
+            f.write(
+                f"ITEM_ID: item_{number}\n"
+                f"NAME: Generated Item {number}\n"
+                f"TYPE: {item_types[number % len(item_types)]}\n"
+                f"EFFECT: {ITEM_STATS[number % len(ITEM_STATS)]}:{1 + number % 50}\n"
+                f"COST: {10 + number % 1000}\n"
+                f"DESCRIPTION: Synthetic item number {number} for benchmarking\n\n"
+            )
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def measure(function, record_count, track_memory=True):
+    """
+    Time one call of function and optionally its peak traced memory
+
+    The timed run and the tracemalloc run are separate because tracing
+    slows allocation-heavy code down by several times.
+
+    Returns: Dictionary with seconds, records_per_sec and peak_bytes
+    """
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+
+    result = {
+        "seconds": round(seconds, 6),
+        "records_per_sec": round(record_count / seconds, 1) if seconds > 0 else None,
+        "peak_bytes": None
+    }
+
+    if track_memory:
+        tracemalloc.start()
+        try:
+            function()
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return result
+
+def max_rss_bytes():
+    """Return this process's peak resident set size, or None if unknown"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+def run_size(count, directory, chain_length=DEFAULT_CHAIN_LENGTH, track_memory=True):
+    """
+    Generate catalogs with count records each and benchmark every loader
+
+    Returns: Dictionary {benchmark_name: measurement}
+    """
+    quests_path = os.path.join(directory, f"quests_{count}.txt")
+    items_path = os.path.join(directory, f"items_{count}.txt")
+    write_quests_file(quests_path, count, chain_length)
+    write_items_file(items_path, count)
+    game_data.clear_compiled_cache(quests_path)
+    game_data.clear_compiled_cache(items_path)
+
+    quests = game_data.load_quests(quests_path, use_cache=False)
+    items = game_data.load_items(items_path, use_cache=False)
+
+    with open(quests_path, 'r') as f:
+        quest_block = f.read().split("\n\n", 1)[0].splitlines()
+    with open(items_path, 'r') as f:
+        item_block = f.read().split("\n\n", 1)[0].splitlines()
+
+    def validate_quests():
+        for quest in quests.values():
+            game_data.validate_quest_data(quest)
+
+    def validate_items():
+        for item in items.values():
+            game_data.validate_item_data(item)
+
+    def parse_quest_blocks():
+        for _ in range(count):
+            game_data.parse_quest_block(quest_block)
+
+    def parse_item_blocks():
+        for _ in range(count):
+            game_data.parse_item_block(item_block)
+
+    # Prime the compiled caches so the *_cached rows measure a warm start
+    game_data.load_quests(quests_path)
+    game_data.load_items(items_path)
+
+    benchmarks = {
+        "load_quests": lambda: game_data.load_quests(quests_path, use_cache=False),
+        "load_quests_cached": lambda: game_data.load_quests(quests_path),
+        "load_items": lambda: game_data.load_items(items_path, use_cache=False),
+        "load_items_cached": lambda: game_data.load_items(items_path),
+        "validate_quest_data": validate_quests,
+        "validate_item_data": validate_items,
+        "parse_quest_block": parse_quest_blocks,
+        "parse_item_block": parse_item_blocks
+    }
+
+    return {
+        name: measure(function, count, track_memory)
+        for name, function in benchmarks.items()
+    }
+
+def make_save_character(number):
+    """Return a mid-game character with filled inventory and quest lists"""
+    character = character_manager.create_character(f"hero_{number}", "Warrior")
+    character.update({
+        "level": 10 + number % 40,
+        "experience": number % 1000,
+        "gold": 500 + number,
+        "inventory": [f"item_{(number + slot) % 500}" for slot in range(20)],
+        "active_quests": [f"quest_{(number + slot) % 300}" for slot in range(3)],
+        "completed_quests": [f"quest_{slot}" for slot in range(25)]
+    })
+    return character
+
+def run_save_formats(count, directory, track_memory=True):
+    """
+    Save and load count characters in every save format
+
+    Returns: Dictionary {format_name: {'save', 'load', 'bytes_per_character'}}
+    """
+    characters = [make_save_character(number) for number in range(count)]
+    results = {}
+
+    for format_name, options in SAVE_FORMATS.items():
+        backend = character_manager.TextSaveBackend(**options)
+        save_directory = os.path.join(directory, f"saves_{format_name}")
+
+        def save_all():
+            for character in characters:
+                backend.save(character, save_directory)
+
+        def load_all():
+            for character in characters:
+                backend.load(character["name"], save_directory)
+
+        save_result = measure(save_all, count, track_memory)
+        load_result = measure(load_all, count, track_memory)
+        total_bytes = sum(
+            os.path.getsize(os.path.join(save_directory, f"{character['name']}_save.txt"))
+            for character in characters
+        )
+        results[format_name] = {
+            "save": save_result,
+            "load": load_result,
+            "bytes_per_character": round(total_bytes / count, 1) if count else None
+        }
+
+    return results
+
+def run_benchmarks(sizes=DEFAULT_SIZES, chain_length=DEFAULT_CHAIN_LENGTH, track_memory=True, directory=None,
+                   save_count=DEFAULT_SAVE_COUNT):
+    """
+    Run every benchmark for each catalog size
+
+    Args:
+        sizes: Record counts to generate for both quests and items
+        chain_length: Length of generated prerequisite chains
+        track_memory: Also measure peak traced memory (slower)
+        directory: Where to write generated files (temporary if None)
+        save_count: Characters to use for the save format benchmarks
+                    (0 skips them)
+
+    Returns: JSON-serializable results dictionary
+    """
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "chain_length": chain_length,
+        "sizes": {}
+    }
+
+    def run_all(output_directory):
+        for count in sizes:
+            results["sizes"][str(count)] = run_size(count, output_directory, chain_length, track_memory)
+        if save_count:
+            results["save_formats"] = run_save_formats(save_count, output_directory, track_memory)
+
+    if directory is None:
+        with tempfile.TemporaryDirectory() as temp_directory:
+            run_all(temp_directory)
+    else:
+        os.makedirs(directory, exist_ok=True)
+        run_all(directory)
+
+    results["max_rss_bytes"] = max_rss_bytes()
+    return results
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game_data loaders on synthetic catalogs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="record counts to benchmark (default: 1000 100000 1000000)")
+    parser.add_argument("--chain-length", type=int, default=DEFAULT_CHAIN_LENGTH,
+                        help="length of generated quest prerequisite chains")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc peak memory runs")
+    parser.add_argument("--directory", default=None,
+                        help="keep generated data files in this directory")
+    parser.add_argument("--save-count", type=int, default=DEFAULT_SAVE_COUNT,
+                        help="characters to use for the save format benchmarks (0 to skip)")
+    parser.add_argument("--output", default=None,
+                        help="write JSON results to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.chain_length, not args.no_memory, args.directory, args.save_count)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Benchmark results written to {args.output}")
+    else:
+        print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ This module handles character creation, loading, and saving.
 """
 
 import os
+from intern_table import intern_id
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -103,35 +104,7 @@ def save_character(character, save_directory="data/save_games"):
     # Create save_directory if it doesn't exist
     # Handle any file I/O errors appropriately
     # Lists should be saved as comma-separated values
-    import os
-
-    os.makedirs(save_directory, exist_ok=True)
-    character_name = character["name"]
-    filename = f"{character_name}_save.txt"
-    full_path = os.path.join(save_directory, filename)
-
-    save_data = [
-        "name", "class", "level", "health", "max_health",
-        "strength", "magic", "experience", "gold"
-    ]
-
-    comma_data = [
-        "inventory", "active_quests", "completed_quests"
-    ]
-
-    try:
-        with open(full_path, 'w') as f:
-            for data in save_data:
-                f.write(f"{data.upper()}: {character[data]}\n")
-
-            for data in comma_data:
-                all_data = ",".join(map(str, character[data]))
-                f.write(f"{data.upper()}: {all_data}\n")
-        return True
-    except IOError as e:
-        raise IOError(f"Error writing save file to {full_path}: {e}")
-    except PermissionError as e:
-        raise PermissionError(f"Permission denied for writing to {full_path}: {e}")
+    return _save_backend.save(character, save_directory)
 
 def load_character(character_name, save_directory="data/save_games"):
     """
@@ -152,65 +125,7 @@ def load_character(character_name, save_directory="data/save_games"):
     # Try to read file → SaveFileCorruptedError
     # Validate data format → InvalidSaveDataError
     # Parse comma-separated lists back into Python lists
-    filename = f"{character_name}_save.txt"
-    full_path = os.path.join(save_directory, filename)
-
-    if not os.path.exists(full_path):
-        raise CharacterNotFoundError(f"No save file found for character: {character_name}")
-    
-    raw_data = {}
-
-    try:
-        with open(full_path, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if not line:
-                    continue
-
-                parts = line.split(': ', 1)
-                if len(parts) == 2:
-                    key = parts[0].strip().lower()
-                    value = parts[1].strip()
-                    raw_data[key] = value
-    except IOError as e:
-        raise SaveFileCorruptedError(f"File reading error for {full_path}: {e}")
-    
-    required_data = {
-        "name": str, "class": str,
-        "level": int, "health": int, "max_health": int,
-        "strength": int, "magic": int, "experience": int, "gold": int
-    }
-
-    comma_list = ["inventory", "active_quests", "completed_quests"]
-
-    character_data = {}
-
-    try:
-        for key, type_func in required_data.items():
-            if key not in raw_data:
-                raise InvalidCharacterClassError(f"Missing required key: {key.upper()}")
-            
-            if type_func is str:
-                character_data[key] = raw_data[key]
-            else:
-                character_data[key] = type_func(raw_data[key])
-            
-        for key in comma_list:
-            if key not in raw_data:
-                character_data[key] = []
-            else:
-                list_str = raw_data[key]
-                if not list_str:
-                    character_data[key] = []
-                else:
-                    character_data[key] = [item.strip() for item in list_str.split(",")]
-    except (ValueError, KeyError, TypeError) as e:
-        raise InvalidSaveDataError(f"Data format error in {character_name}'s save file: {e}")
-    
-    if character_data.get("name") != character_name:
-        raise InvalidSaveDataError(f"Name mismatch: File is for '{character_data.get('name')}', but requested '{character_name}'")
-    
-    return character_data
+    return _save_backend.load(character_name, save_directory)
 
 def list_saved_characters(save_directory="data/save_games"):
     """
@@ -221,19 +136,103 @@ def list_saved_characters(save_directory="data/save_games"):
     # TODO: Implement this function
     # Return empty list if directory doesn't exist
     # Extract character names from filenames
-    import os 
+    return _save_backend.list_names(save_directory)
+
+def save_characters(characters, save_directory="data/save_games"):
+    """
+    Save several characters in one batch
+    
+    Uses the save backend's save_many, which writes the whole batch
+    together (one directory fsync for text saves, one transaction for
+    SQLite) instead of one full save_character per character.
+    
+    Returns: True if successful
+    """
+    return _save_backend.save_many(list(characters), save_directory)
+
+# Per-file errors load_all_characters reports instead of raising
+LOAD_ERRORS = (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError,
+    InvalidCharacterClassError
+)
 
-    if not os.path.isdir(save_directory):
-        return []
+def load_all_characters(save_directory="data/save_games", workers=4, mode="thread"):
+    """
+    Load every saved character in parallel, returning results as they finish
     
-    saved_characters = []
+    Args:
+        save_directory: Directory containing save files
+        workers: Number of loader threads or processes
+        mode: "thread" (shares this process; good for I/O-bound loads)
+              or "process" (separate processes; parses in parallel)
+    
+    Names come from list_saved_characters and each one is loaded with the
+    current save backend. A bad file doesn't stop the scan; its error is
+    reported instead. Only a bounded number of loads are queued at once,
+    so memory stays flat for very large save directories. Results come
+    in completion order, not name order.
+    
+    Returns: Iterator of tuples (character_name, character, error) where
+             character is None if error is set (one of LOAD_ERRORS; a save
+             missing a required key is reported as InvalidCharacterClassError)
+    Raises: ValueError if mode or workers is not valid (right away, not
+            when the iterator is first used)
+    """
+    if mode not in ("thread", "process"):
+        raise ValueError(f"Invalid load mode: '{mode}'. Must be 'thread' or 'process'.")
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+
+    return _iter_all_characters(_save_backend, save_directory, workers, mode)
 
-    for filename in os.listdir(save_directory):
-        if filename.endswith("_save.txt"):
-            char_name = filename[:-len("_save.txt")]
-            saved_characters.append(char_name)
+def _iter_all_characters(backend, save_directory, workers, mode):
+    """Generator behind load_all_characters (arguments already validated)"""
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
 
-    return saved_characters
+    names = iter(backend.list_names(save_directory))
+
+    if mode == "thread":
+        executor = ThreadPoolExecutor(max_workers=workers)
+        chunk_size = 1
+    else:
+        # Send names in chunks so the per-task pickling cost is amortized
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunk_size = 64
+
+    def next_chunk():
+        chunk = []
+        for name in names:
+            chunk.append(name)
+            if len(chunk) == chunk_size:
+                break
+        return chunk
+
+    with executor:
+        running = set()
+        while True:
+            while len(running) < workers * 4:
+                chunk = next_chunk()
+                if not chunk:
+                    break
+                running.add(executor.submit(_load_characters_chunk, backend, chunk, save_directory))
+            if not running:
+                return
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+def _load_characters_chunk(backend, names, save_directory):
+    """Load a list of characters for load_all_characters (runs in a worker)"""
+    results = []
+    for name in names:
+        try:
+            results.append((name, backend.load(name, save_directory), None))
+        except LOAD_ERRORS as e:
+            results.append((name, None, e))
+    return results
 
 def delete_character(character_name, save_directory="data/save_games"):
     """
@@ -244,15 +243,523 @@ def delete_character(character_name, save_directory="data/save_games"):
     """
     # TODO: Implement character deletion
     # Verify file exists before attempting deletion
-    filename = f"{character_name}_save.txt"
-    filepath = os.path.join(save_directory, filename)
+    return _save_backend.delete(character_name, save_directory)
 
-    if not os.path.exists(filepath):
-        raise CharacterNotFoundError(f"Character save file not found for: {character_name}")
+# ============================================================================
+# SAVE BACKENDS
+# ============================================================================
+
+class TextSaveBackend:
+    """
+    Stores each character in its own {name}_save.txt file
+    
+    This is the default backend. Every backend provides the same methods
+    (save, load, delete, list_names, save_many) with the same arguments
+    and exceptions as the module-level save functions, so
+    set_save_backend can swap one for another, e.g. the SQLite backend
+    in save_storage.
     
-    os.remove(filepath)
+    Args:
+        save_format: "text" for KEY: value lines, or "binary" for the
+                     packed format in save_codec (same file name)
+        compress: zlib-compress binary saves
+        fsync_policy: "never" (leave flushing to the OS), "batch"
+                      (fsync once per save_many batch) or "always"
+                      (fsync every save before returning)
+    
+    load reads either format, whatever save_format is set to.
+    
+    Saves are atomic: the data is written to a temporary file, the old
+    save is renamed to {name}_save.txt.prev and the temporary file is
+    renamed into place, so a crash never leaves a half-written file
+    where load will look first. Every file ends with a CHECKSUM line (see
+    add_checksum). load checks the end of the file for that line before
+    parsing and falls back to the .prev generation if it is missing or
+    wrong.
+    
+    Raises: ValueError if save_format or fsync_policy is not valid
+    """
+
+    SAVE_FORMATS = ("text", "binary")
+    FSYNC_POLICIES = ("never", "batch", "always")
+
+    def __init__(self, save_format="text", compress=False, fsync_policy="batch"):
+        if save_format not in self.SAVE_FORMATS:
+            raise ValueError(f"Invalid save format: '{save_format}'. Must be one of {', '.join(self.SAVE_FORMATS)}.")
+        if fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy: '{fsync_policy}'. Must be one of {', '.join(self.FSYNC_POLICIES)}.")
+        self.save_format = save_format
+        self.compress = compress
+        self.fsync_policy = fsync_policy
+
+    def save(self, character, save_directory):
+        import os
+
+        os.makedirs(save_directory, exist_ok=True)
+        character_name = character["name"]
+        filename = f"{character_name}_save.txt"
+        full_path = os.path.join(save_directory, filename)
+
+        data = self.encode(character)
+        always = self.fsync_policy == "always"
+
+        try:
+            temp_path = self._write_temp(full_path, data, always)
+            self._install(temp_path, full_path)
+        except IOError as e:
+            raise IOError(f"Error writing save file to {full_path}: {e}")
+        except PermissionError as e:
+            raise PermissionError(f"Permission denied for writing to {full_path}: {e}")
+
+        if always:
+            fsync_directory(save_directory)
+        return True
+
+    def _write_temp(self, full_path, data, fsync):
+        """Write data plus its checksum line next to full_path; return the temp path"""
+        import threading
+
+        temp_path = f"{full_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(add_checksum(data))
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return temp_path
+
+    def _install(self, temp_path, full_path):
+        """Keep the current save as the .prev generation and move temp_path into place"""
+        if os.path.exists(full_path):
+            os.replace(full_path, full_path + PREVIOUS_SUFFIX)
+        os.replace(temp_path, full_path)
+
+    def encode(self, character):
+        """
+        Return the bytes save would write for character
+        
+        Raises: KeyError if a field is missing (text format),
+                InvalidSaveDataError if a field is missing (binary format)
+        """
+        if self.save_format == "binary":
+            import save_codec
+
+            return save_codec.encode_character(character, self.compress)
+
+        save_data = [
+            "name", "class", "level", "health", "max_health",
+            "strength", "magic", "experience", "gold"
+        ]
+
+        comma_data = [
+            "inventory", "active_quests", "completed_quests"
+        ]
+
+        lines = []
+        for data in save_data:
+            lines.append(f"{data.upper()}: {character[data]}\n")
+
+        for data in comma_data:
+            all_data = ",".join(map(str, character[data]))
+            lines.append(f"{data.upper()}: {all_data}\n")
+        return "".join(lines).encode("utf-8")
+
+    def load(self, character_name, save_directory):
+        filename = f"{character_name}_save.txt"
+        full_path = os.path.join(save_directory, filename)
+        previous_path = full_path + PREVIOUS_SUFFIX
+
+        has_previous = os.path.exists(previous_path)
+        if not os.path.exists(full_path) and not has_previous:
+            raise CharacterNotFoundError(f"No save file found for character: {character_name}")
+
+        try:
+            return self._load_file(full_path, character_name, has_previous)
+        except (SaveFileCorruptedError, FileNotFoundError):
+            if not has_previous:
+                raise
+            # Torn or missing current file (crash mid-save): use the last good one
+            return self._load_file(previous_path, character_name, False)
+
+    def _load_file(self, full_path, character_name, require_checksum):
+        """
+        Read, verify and decode one save file
+        
+        A file without a CHECKSUM line is accepted as an older save unless
+        require_checksum is set (a .prev exists, so this writer made it).
+        
+        Raises: SaveFileCorruptedError if the file is torn or unreadable,
+                InvalidSaveDataError if its contents are wrong
+        """
+        try:
+            with open(full_path, 'rb') as file:
+                content = file.read()
+        except FileNotFoundError:
+            raise
+        except IOError as e:
+            raise SaveFileCorruptedError(f"File reading error for {full_path}: {e}")
+
+        content, status = split_checksum(content)
+        if status == "bad" or (status == "missing" and require_checksum):
+            raise SaveFileCorruptedError(f"Save file is incomplete or damaged: {full_path}")
+
+        import save_codec
+
+        if save_codec.is_binary_save(content):
+            character_data = save_codec.decode_character(content)
+        else:
+            try:
+                text = content.decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise SaveFileCorruptedError(f"File reading error for {full_path}: {e}")
+            character_data = self._parse_text(text, character_name)
+
+        if character_data.get("name") != character_name:
+            raise InvalidSaveDataError(f"Name mismatch: File is for '{character_data.get('name')}', but requested '{character_name}'")
+
+        return character_data
+
+    def _parse_text(self, text, character_name):
+        """Parse the KEY: value text format into a character dictionary"""
+        raw_data = {}
+
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            parts = line.split(': ', 1)
+            if len(parts) == 2:
+                key = parts[0].strip().lower()
+                value = parts[1].strip()
+                raw_data[key] = value
+
+        required_data = {
+            "name": str, "class": str,
+            "level": int, "health": int, "max_health": int,
+            "strength": int, "magic": int, "experience": int, "gold": int
+        }
+
+        comma_list = ["inventory", "active_quests", "completed_quests"]
+
+        character_data = {}
+
+        try:
+            for key, type_func in required_data.items():
+                if key not in raw_data:
+                    raise InvalidCharacterClassError(f"Missing required key: {key.upper()}")
+
+                if type_func is str:
+                    character_data[key] = raw_data[key]
+                else:
+                    character_data[key] = type_func(raw_data[key])
+
+            for key in comma_list:
+                if key not in raw_data:
+                    character_data[key] = []
+                else:
+                    list_str = raw_data[key]
+                    if not list_str:
+                        character_data[key] = []
+                    else:
+                        character_data[key] = [intern_id(item.strip()) for item in list_str.split(",")]
+        except (ValueError, KeyError, TypeError) as e:
+            raise InvalidSaveDataError(f"Data format error in {character_name}'s save file: {e}")
+
+        return character_data
+
+    def delete(self, character_name, save_directory):
+        filename = f"{character_name}_save.txt"
+        filepath = os.path.join(save_directory, filename)
+
+        if not os.path.exists(filepath) and not os.path.exists(filepath + PREVIOUS_SUFFIX):
+            raise CharacterNotFoundError(f"Character save file not found for: {character_name}")
+
+        for path in (filepath, filepath + PREVIOUS_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
+
+        return True
+
+    def list_names(self, save_directory):
+        import os 
 
-    return True
+        if not os.path.isdir(save_directory):
+            return []
+
+        saved_characters = []
+
+        filenames = set(os.listdir(save_directory))
+        for filename in filenames:
+            if filename.endswith("_save.txt"):
+                char_name = filename[:-len("_save.txt")]
+                saved_characters.append(char_name)
+            elif filename.endswith("_save.txt" + PREVIOUS_SUFFIX) and filename[:-len(PREVIOUS_SUFFIX)] not in filenames:
+                # Only the previous generation survived an interrupted save
+                saved_characters.append(filename[:-len("_save.txt" + PREVIOUS_SUFFIX)])
+
+        return saved_characters
+
+    def save_many(self, characters, save_directory):
+        """
+        Save several characters as one group commit
+        
+        Every character is written to a temporary file (fsynced unless
+        fsync_policy is "never"), then all of them are installed with
+        os.replace and the directory is fsynced once, so the renames cost
+        one directory flush per batch instead of one per character.
+        
+        A character with missing fields is skipped rather than failing
+        the whole batch; the others are still written.
+        
+        Returns: True if successful
+        Raises: InvalidSaveDataError naming the skipped characters (after
+                the rest of the batch is written)
+        """
+        fsync = self.fsync_policy != "never"
+        os.makedirs(save_directory, exist_ok=True)
+        staged = []
+        skipped = []
+        installed = 0
+        try:
+            for character in characters:
+                try:
+                    full_path = os.path.join(save_directory, f"{character['name']}_save.txt")
+                    data = self.encode(character)
+                except (KeyError, InvalidSaveDataError):
+                    skipped.append(str(character.get('name', '<unnamed>')))
+                    continue
+                staged.append((self._write_temp(full_path, data, fsync), full_path))
+
+            for temp_path, full_path in staged:
+                self._install(temp_path, full_path)
+                installed += 1
+        except IOError as e:
+            raise IOError(f"Error writing save files to {save_directory}: {e}")
+        finally:
+            for temp_path, _ in staged[installed:]:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+        if fsync:
+            fsync_directory(save_directory)
+        if skipped:
+            raise InvalidSaveDataError(f"Characters missing required fields were not saved: {', '.join(skipped)}")
+        return True
+
+PREVIOUS_SUFFIX = ".prev"
+CHECKSUM_PREFIX = b"CHECKSUM: "
+CHECKSUM_LINE_SIZE = len(CHECKSUM_PREFIX) + 9
+
+def add_checksum(data):
+    """
+    Append a CHECKSUM line holding the CRC-32 of data
+    
+    The line has a fixed size and looks like any other KEY: value line,
+    so older text loaders just ignore it.
+    """
+    import zlib
+
+    return data + CHECKSUM_PREFIX + b"%08x\n" % zlib.crc32(data)
+
+def split_checksum(content):
+    """
+    Separate a save file's data from its CHECKSUM line
+    
+    Only the last CHECKSUM_LINE_SIZE bytes are inspected to find the
+    line, so a torn file (cut off before the line was written) is spotted
+    without parsing anything.
+    
+    Returns: Tuple of (data, status) with status "ok", "bad" (checksum
+             doesn't match) or "missing" (no CHECKSUM line)
+    """
+    import zlib
+
+    tail = content[-CHECKSUM_LINE_SIZE:]
+    if len(tail) != CHECKSUM_LINE_SIZE or not tail.startswith(CHECKSUM_PREFIX) or not tail.endswith(b"\n"):
+        return content, "missing"
+
+    data = content[:-CHECKSUM_LINE_SIZE]
+    try:
+        expected = int(tail[len(CHECKSUM_PREFIX):-1], 16)
+    except ValueError:
+        return data, "bad"
+    return data, "ok" if zlib.crc32(data) == expected else "bad"
+
+def fsync_directory(directory):
+    """
+    Flush a directory entry (e.g. after os.replace) to disk
+    
+    Does nothing where directories can't be opened (Windows).
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+_save_backend = TextSaveBackend()
+
+def get_save_backend():
+    """Return the backend the save functions currently use"""
+    return _save_backend
+
+def set_save_backend(backend):
+    """
+    Route save/load/delete/list through backend
+    
+    Returns: The previous backend, so callers can restore it
+    """
+    global _save_backend
+    previous = _save_backend
+    _save_backend = backend
+    return previous
+
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+
+class CharacterCache:
+    """
+    Write-back LRU cache of loaded characters for one save directory
+    
+    get returns the same dictionary on every hit, so callers edit it in
+    place and call mark_dirty (or put) instead of saving right away.
+    Dirty characters are written with save_character when they are
+    evicted or when flush is called. Leaving a with block flushes.
+    
+    Counters (see stats): hits, misses, evictions.
+    
+    Raises: ValueError if capacity is less than 1
+    """
+
+    def __init__(self, capacity=32, save_directory="data/save_games"):
+        from collections import OrderedDict
+        import threading
+
+        if capacity < 1:
+            raise ValueError(f"Cache capacity must be at least 1, got {capacity}")
+
+        self.capacity = capacity
+        self.save_directory = save_directory
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._dirty = set()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, character_name):
+        return character_name in self._entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def get(self, character_name):
+        """
+        Get a character, loading it with load_character on a miss
+        
+        Raises: Same exceptions as load_character
+        """
+        with self._lock:
+            character = self._entries.get(character_name)
+            if character is not None:
+                self._entries.move_to_end(character_name)
+                self.hits += 1
+                return character
+
+            self.misses += 1
+            character = load_character(character_name, self.save_directory)
+            self._insert(character_name, character)
+            return character
+
+    def put(self, character, dirty=True):
+        """Add or replace a character (marked dirty unless dirty=False)"""
+        with self._lock:
+            name = character["name"]
+            self._insert(name, character)
+            if dirty:
+                self._dirty.add(name)
+
+    def mark_dirty(self, character_name):
+        """
+        Record that a cached character changed and needs saving
+        
+        Raises: CharacterNotFoundError if the character isn't cached
+        """
+        with self._lock:
+            if character_name not in self._entries:
+                raise CharacterNotFoundError(f"Character is not cached: {character_name}")
+            self._dirty.add(character_name)
+
+    def is_dirty(self, character_name):
+        return character_name in self._dirty
+
+    def flush(self, character_name=None):
+        """
+        Save dirty characters (just character_name if given)
+        
+        Returns: Number of characters saved
+        """
+        with self._lock:
+            if character_name is None:
+                names = [name for name in self._entries if name in self._dirty]
+            else:
+                names = [character_name] if character_name in self._dirty else []
+
+            for name in names:
+                save_character(self._entries[name], self.save_directory)
+                self._dirty.discard(name)
+            return len(names)
+
+    def discard(self, character_name):
+        """Drop a character from the cache without saving it"""
+        with self._lock:
+            self._entries.pop(character_name, None)
+            self._dirty.discard(character_name)
+
+    def stats(self):
+        """Return the cache counters as a dictionary"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "dirty": len(self._dirty),
+                "capacity": self.capacity
+            }
+
+    def _insert(self, character_name, character):
+        """Store a character as most recently used, evicting if over capacity"""
+        self._entries[character_name] = character
+        self._entries.move_to_end(character_name)
+
+        while len(self._entries) > self.capacity:
+            oldest = next(iter(self._entries))
+            # Save before removing so a failed save doesn't lose the changes
+            self.flush(oldest)
+            del self._entries[oldest]
+            self.evictions += 1
 
 # ============================================================================
 # CHARACTER OPERATIONS
@@ -280,21 +787,8 @@ def gain_experience(character, xp_amount):
     if character['health'] <= 0:
         raise CharacterDeadError(f"{character['name']} is dead and cannot gain experience.")
     
-    character['experience'] += xp_amount
-
-    while True:
-        required_xp = character['level'] * 100
-
-        if character['experience'] >= required_xp:
-            character['level'] +=1
-            character['max_health'] += 10
-            character['strength'] += 2
-            character['magic'] += 2
-            character['health'] = character['max_health']
-            character['experience'] -= required_xp
-            print(f"{character['name']} levled up to Level {character['level']}!")
-        else:
-            break
+    if apply_experience(character, xp_amount):
+        print(f"{character['name']} levled up to Level {character['level']}!")
 
 def add_gold(character, amount):
     """
@@ -376,6 +870,62 @@ def revive_character(character):
         print(f"Cannot revive {character['name']}: 'max_health' not defined or health is invalid.")
         return False
 
+# ============================================================================
+# LEVELING ENGINE
+# ============================================================================
+
+XP_PER_LEVEL = 100
+LEVEL_UP_GAINS = {"max_health": 10, "strength": 2, "magic": 2}
+
+def compute_level_ups(level, experience):
+    """
+    Work out how many levels a pool of experience buys, in O(1)
+    
+    Going from level L up k levels costs XP_PER_LEVEL * (L + (L+1) + ...
+    + (L+k-1)) = XP_PER_LEVEL * (k*L + k*(k-1)/2), so the largest
+    affordable k is the floor of the positive root of
+    k^2 + (2L-1)k - 2*experience/XP_PER_LEVEL = 0. math.isqrt keeps
+    this exact for any size of XP grant.
+    
+    Args:
+        level: Current level
+        experience: Experience held at that level (after adding rewards)
+    
+    Returns: Tuple of (levels_gained, leftover_experience)
+    """
+    import math
+
+    units = experience // XP_PER_LEVEL
+    if units < level:
+        return 0, experience
+
+    b = 2 * level - 1
+    levels = (math.isqrt(b * b + 8 * units) - b) // 2
+    spent = XP_PER_LEVEL * (levels * level + levels * (levels - 1) // 2)
+    return levels, experience - spent
+
+def apply_experience(character, xp_amount):
+    """
+    Add experience to character and apply every level up at once
+    
+    Each level gained adds LEVEL_UP_GAINS to the character's stats and
+    health is restored to max_health if at least one level was gained.
+    Does not check whether the character is alive (see gain_experience).
+    
+    Returns: Number of levels gained
+    """
+    experience = character.get('experience', 0) + xp_amount
+    levels, experience = compute_level_ups(character.get('level', 1), experience)
+    character['experience'] = experience
+
+    if levels:
+        character['level'] = character.get('level', 1) + levels
+        for stat, gain in LEVEL_UP_GAINS.items():
+            character[stat] = character.get(stat, 0) + gain * levels
+        character['health'] = character['max_health']
+
+    return levels
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
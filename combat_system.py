@@ -178,22 +178,10 @@ class SimpleBattle:
                     gold_gained = enemy.get('gold_reward', 0)
                     
                     if xp_gained > 0:
-                        char['experience'] = char.get('experience', 0) + xp_gained
-
-                        while True:
-                            current_level = char.get('level', 1)
-                            required_xp = current_level * 100
-                
-                            if char['experience'] >= required_xp:
-                                char['level'] = char.get('level', 1) + 1
-                                char['max_health'] = char.get('max_health', 0) + 10
-                                char['strength'] = char.get('strength', 0) + 2
-                                char['magic'] = char.get('magic', 0) + 2
-                                char['health'] = char['max_health']
-                                char['experience'] -= required_xp
-                                print(f"{char['name']} leveled up to Level {char['level']}!")
-                            else:
-                                break
+                        import character_manager
+
+                        if character_manager.apply_experience(char, xp_gained):
+                            print(f"{char['name']} leveled up to Level {char['level']}!")
 
                     if gold_gained > 0:
                         char['gold'] = char.get('gold', 0) + gold_gained
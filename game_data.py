@@ -10,17 +10,134 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import mmap
+import pickle
+import hashlib
+import bisect
+import struct
+import threading
+import weakref
+from collections.abc import Mapping
+from intern_table import intern_id
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
-    CorruptedDataError
+    CorruptedDataError,
+    QuestNotFoundError
 )
 
+# Bump this whenever the shape of parsed quest/item records changes so old
+# cache files are ignored instead of handing back stale dictionaries.
+CACHE_VERSION = 5
+CACHE_CHECKSUM_SIZE = 20
+CACHE_SUFFIX = ".cache"
+INDEX_SUFFIX = ".index"
+
+QUEST_REQUIRED_KEYS = [
+    "quest_id", "title", "description",
+    "reward_xp", "reward_gold", "required_level", "prerequisite"
+]
+ITEM_REQUIRED_KEYS = ["item_id", "name", "type", "effect", "cost", "description"]
+VALID_ITEM_TYPES = ("weapon", "armor", "consumable")
+
+# ============================================================================
+# RECORD TYPES
+# ============================================================================
+
+class SlotRecord(Mapping):
+    """
+    Base for compact catalog records
+    
+    Fields live in __slots__ instead of a per-record dict, but records still
+    behave like read/write dictionaries (record['cost'], record.get('cost'),
+    'cost' in record, dict(record), == against a plain dict) so existing
+    code that expects load_quests/load_items dictionaries keeps working.
+    """
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._fields:
+            raise KeyError(f"{type(self).__name__} has no field '{key}'")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        # Rebuild through __init__ so ids loaded from a cache are interned
+        return (type(self), tuple(getattr(self, field) for field in self._fields))
+
+class ItemEffect(SlotRecord):
+    """
+    An item's effect, compiled once when the catalog is loaded
+    
+    Reads like {'stat': 'strength', 'value': 5}, but is immutable and
+    hashable so one instance can be shared by every user of the item and
+    the inventory functions never need to re-parse "stat:value" strings.
+    """
+    __slots__ = ("stat", "value")
+    _fields = __slots__
+
+    def __init__(self, stat, value):
+        object.__setattr__(self, "stat", intern_id(stat))
+        object.__setattr__(self, "value", value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ItemEffect is immutable")
+
+    def __setitem__(self, key, value):
+        raise TypeError("ItemEffect is immutable")
+
+    def __hash__(self):
+        return hash((self.stat, self.value))
+
+class QuestRecord(SlotRecord):
+    """One quest as returned by load_quests"""
+    __slots__ = ("id", "title", "description", "reward_xp", "reward_gold", "required_level", "prerequisite")
+    _fields = __slots__
+
+    def __init__(self, id, title, description, reward_xp, reward_gold, required_level, prerequisite):
+        self.id = intern_id(id)
+        self.title = title
+        self.description = description
+        self.reward_xp = reward_xp
+        self.reward_gold = reward_gold
+        self.required_level = required_level
+        self.prerequisite = intern_id(prerequisite)
+
+class ItemRecord(SlotRecord):
+    """One item as returned by load_items"""
+    __slots__ = ("id", "name", "type", "effect", "cost", "description")
+    _fields = __slots__
+
+    def __init__(self, id, name, type, effect, cost, description):
+        self.id = intern_id(id)
+        self.name = name
+        self.type = intern_id(type)
+        self.effect = effect
+        self.cost = cost
+        self.description = description
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=True):
     """
     Load quest data from file
     
@@ -33,6 +150,10 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
+    If use_cache is True the parsed quests are stored in a compiled cache
+    file next to the source (see load_compiled_cache) and reused on the next
+    start as long as the text file has not changed.
+    
     Returns: Dictionary of quests {quest_id: quest_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
@@ -41,73 +162,62 @@ def load_quests(filename="data/quests.txt"):
     # - FileNotFoundError → raise MissingDataFileError
     # - Invalid format → raise InvalidDataFormatError
     # - Corrupted/unreadable data → raise CorruptedDataError
-    import os
+    if not use_cache:
+        return _parse_quest_file(filename)
+    return _load_with_cache(filename, "quests", _parse_quest_file)
+
+def _parse_quest_file(filename):
+    """Parse quests.txt without touching the compiled cache"""
     all_quests = {}
 
     if not os.path.exists(filename):
         raise MissingDataFileError(f"Quest file not found at: {filename}")
-        
+
     try:
-        with open(filename, 'r') as f:
-            lines = [line.strip() for line in f]
-            
-    except Exception as e:
+        for raw_quest in iter_records(filename):
+            quest_details = build_quest_record(raw_quest)
+            quest_id = quest_details["id"]
+
+            if quest_id in all_quests:
+                raise InvalidDataFormatError(f"Duplicate quest_id found: {quest_id}")
+
+            all_quests[quest_id] = quest_details
+    except (OSError, UnicodeDecodeError) as e:
         raise CorruptedDataError(f"Error reading quest file: {e}")
 
-    quest_data_lines = []
-    current_quest = {}
-    
-    for line in lines:
-        if not line: 
-            if current_quest:
-                quest_data_lines.append(current_quest)
-                current_quest = {}
-            continue
-        
-        if ':' in line:
-            key, value = line.split(':', 1)
-            current_quest[key.strip()] = value.strip()
-        else:
-            raise InvalidDataFormatError(f"Quest line format error: '{line}' is missing a colon separator.")
+    return all_quests
 
-    if current_quest:
-        quest_data_lines.append(current_quest)
-        
-    required_keys = [
-        "quest_id", "title", "description", 
-        "reward_xp", "reward_gold", "required_level", "prerequisite"
-    ]
+def build_quest_record(raw_quest):
+    """
+    Turn one block of raw quest fields into a quest dictionary
     
-    for raw_quest in quest_data_lines:
-        
-        for key in required_keys:
-            if key not in raw_quest:
-                quest_id = raw_quest.get("quest_id", "Unknown Quest")
-                raise InvalidDataFormatError(f"Quest '{quest_id}' is missing required field: {key}")
+    Args:
+        raw_quest: Dictionary of lowercase field name -> string value
+    
+    Returns: QuestRecord as stored by load_quests
+    Raises: InvalidDataFormatError, CorruptedDataError
+    """
+    for key in QUEST_REQUIRED_KEYS:
+        if key not in raw_quest:
+            quest_id = raw_quest.get("quest_id", "Unknown Quest")
+            raise InvalidDataFormatError(f"Quest '{quest_id}' is missing required field: {key}")
 
-        quest_id = raw_quest["quest_id"]
-        
-        try:
-            quest_details = {
-                "id": quest_id,
-                "title": raw_quest["title"],
-                "description": raw_quest["description"],
-                "reward_xp": int(raw_quest["reward_xp"]),
-                "reward_gold": int(raw_quest["reward_gold"]),
-                "required_level": int(raw_quest["required_level"]),
-                "prerequisite": raw_quest["prerequisite"] if raw_quest["prerequisite"].upper() != 'NONE' else None
-            }
-        except ValueError:
-            raise CorruptedDataError(f"Quest '{quest_id}' has non-numeric value for a reward or level field.")
-        
-        if quest_id in all_quests:
-            raise InvalidDataFormatError(f"Duplicate quest_id found: {quest_id}")
-            
-        all_quests[quest_id] = quest_details
+    quest_id = raw_quest["quest_id"]
 
-    return all_quests
+    try:
+        return QuestRecord(
+            id=quest_id,
+            title=raw_quest["title"],
+            description=raw_quest["description"],
+            reward_xp=int(raw_quest["reward_xp"]),
+            reward_gold=int(raw_quest["reward_gold"]),
+            required_level=int(raw_quest["required_level"]),
+            prerequisite=raw_quest["prerequisite"] if raw_quest["prerequisite"].upper() != 'NONE' else None
+        )
+    except ValueError:
+        raise CorruptedDataError(f"Quest '{quest_id}' has non-numeric value for a reward or level field.")
 
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=True):
     """
     Load item data from file
     
@@ -119,93 +229,208 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
+    Uses the same compiled cache as load_quests when use_cache is True.
+    
     Returns: Dictionary of items {item_id: item_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
     # TODO: Implement this function
     # Must handle same exceptions as load_quests
-    import os
+    if not use_cache:
+        return _parse_item_file(filename)
+    return _load_with_cache(filename, "items", _parse_item_file)
+
+def _parse_item_file(filename):
+    """Parse items.txt without touching the compiled cache"""
     all_items = {}
-    
+
     if not os.path.exists(filename):
         raise FileNotFoundError(f"Item data file not found at: {filename}")
-        
+
     try:
-        with open(filename, 'r') as f:
-            lines = [line.strip() for line in f]
-            
-    except Exception as e:
+        for raw_item in iter_records(filename):
+            item_details = build_item_record(raw_item)
+            item_id = item_details["id"]
+
+            if item_id in all_items:
+                raise ValueError(f"Duplicate item_id found: {item_id}")
+
+            all_items[item_id] = item_details
+    except (OSError, UnicodeDecodeError) as e:
         raise IOError(f"Error reading item file: {e}")
 
-    item_data_lines = []
-    current_item = {}
+    return all_items
+
+def build_item_record(raw_item):
+    """
+    Turn one block of raw item fields into an item dictionary
     
-    for line in lines:
-        if not line:
-            if current_item:
-                item_data_lines.append(current_item)
-                current_item = {}
-            continue
-        
-        if ':' in line:
-            key, value = line.split(':', 1)
-            current_item[key.strip().lower()] = value.strip() 
-        else:
-            item_id = current_item.get("item_id", "Unknown Item in preceding block")
-            raise ValueError(f"Invalid data format near item '{item_id}'. Line missing colon separator: '{line}'")
+    Args:
+        raw_item: Dictionary of lowercase field name -> string value
+    
+    Returns: ItemRecord as stored by load_items
+    Raises: ValueError if a field is missing or malformed
+    """
+    for key in ITEM_REQUIRED_KEYS:
+        if key not in raw_item:
+            item_id = raw_item.get("item_id", "unknown item")
+            raise ValueError(f"Item '{item_id}' is missing required field: {key}")
 
-    if current_item:
-        item_data_lines.append(current_item)
-        
-    required_keys = [
-        "item_id", "name", "type", "effect", "cost", "description"
-    ]
+    item_id = raw_item["item_id"]
+
+    effect_raw = raw_item["effect"]
+    if ':' not in effect_raw:
+        raise ValueError(f"Item '{item_id}' has an invalid effect format: '{effect_raw}'. Expected 'stat:value'.")
+
+    effect_stat, effect_value_raw = effect_raw.split(':', 1)
+
+    try:
+        cost = int(raw_item["cost"])
+        effect_value = int(effect_value_raw.strip())
+    except ValueError as e:
+        raise ValueError(f"Item '{item_id}' has non-numeric value for 'cost' or 'effect' value. Details: {e}")
+
+    item_type = raw_item["type"].lower()
+    if item_type not in VALID_ITEM_TYPES:
+        raise ValueError(f"Item '{item_id}' has invalid type: '{item_type}'. Must be one of {', '.join(VALID_ITEM_TYPES)}.")
+
+    return ItemRecord(
+        id=item_id,
+        name=raw_item["name"],
+        type=item_type,
+        effect=ItemEffect(effect_stat.strip(), effect_value),
+        cost=cost,
+        description=raw_item["description"]
+    )
+
+def load_all(paths, workers=4):
+    """
+    Load many quest/item catalog files concurrently
     
-    for raw_item in item_data_lines:
-        
-        for key in required_keys:
-            if key not in raw_item:
-                item_id = raw_item.get("item_id", "unknown item")
-                raise ValueError(f"Item '{item_id}' is missing required field: {key}")
+    Args:
+        paths: List of (kind, filename) pairs where kind is "quests" or "items"
+        workers: Maximum number of loader threads
+    
+    Each file goes through load_quests or load_items (and so through the
+    compiled cache). A failure in one file does not stop the others.
+    
+    Returns: Tuple (records, errors) where records maps filename to its
+             loaded dictionary and errors maps filename to the exception
+    Raises: ValueError if a kind is not recognized
+    """
+    from concurrent.futures import ThreadPoolExecutor
 
-        item_id = raw_item["item_id"]
-        
-        effect_raw = raw_item["effect"]
-        if ':' not in effect_raw:
-            raise ValueError(f"Item '{item_id}' has an invalid effect format: '{effect_raw}'. Expected 'stat:value'.")
-        
-        effect_stat, effect_value_raw = effect_raw.split(':', 1)
-        
-        try:
-            cost = int(raw_item["cost"])
-            effect_value = int(effect_value_raw.strip())
-            
-        except ValueError as e:
-            raise ValueError(f"Item '{item_id}' has non-numeric value for 'cost' or 'effect' value. Details: {e}")
-        
-        item_type = raw_item["type"].lower()
-        valid_types = {"weapon", "armor", "consumable"}
-        if item_type not in valid_types:
-            raise ValueError(f"Item '{item_id}' has invalid type: '{item_type}'. Must be one of {', '.join(valid_types)}.")
-            
-        item_details = {
-            "id": item_id,
-            "name": raw_item["name"],
-            "type": item_type,
-            "effect": {
-                "stat": effect_stat.strip(),
-                "value": effect_value
-            },
-            "cost": cost,
-            "description": raw_item["description"]
-        }
-        
-        if item_id in all_items:
-            raise ValueError(f"Duplicate item_id found: {item_id}")
-            
-        all_items[item_id] = item_details
+    loaders = {"quests": load_quests, "items": load_items}
+    for kind, filename in paths:
+        if kind not in loaders:
+            raise ValueError(f"Unknown catalog kind '{kind}' for {filename}. Must be 'quests' or 'items'.")
 
-    return all_items
+    records = {}
+    errors = {}
+    if not paths:
+        return records, errors
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as pool:
+        futures = [(filename, pool.submit(loaders[kind], filename)) for kind, filename in paths]
+        for filename, future in futures:
+            try:
+                records[filename] = future.result()
+            except Exception as e:
+                errors[filename] = e
+
+    return records, errors
+
+# Duplicate id policies for catalog packs (see load_packs)
+DUPLICATE_POLICIES = ("error", "override", "keep")
+
+def load_manifest(manifest_path):
+    """
+    Read a catalog pack manifest
+    
+    Expected format per pack (separated by blank lines), with FILE
+    relative to the manifest's directory:
+    PACK_ID: base_items
+    KIND: items
+    FILE: items.txt
+    ON_DUPLICATE: error|override|keep (optional, default error)
+    
+    Packs are merged in the order they are listed.
+    
+    Returns: List of pack dictionaries {'id', 'kind', 'file', 'on_duplicate'}
+    Raises: MissingDataFileError, InvalidDataFormatError
+    """
+    if not os.path.exists(manifest_path):
+        raise MissingDataFileError(f"Pack manifest not found at: {manifest_path}")
+
+    base_directory = os.path.dirname(manifest_path)
+    packs = []
+    pack_ids = set()
+
+    for raw_pack in iter_records(manifest_path):
+        for key in ("pack_id", "kind", "file"):
+            if key not in raw_pack:
+                raise InvalidDataFormatError(f"Pack '{raw_pack.get('pack_id', 'unknown pack')}' is missing required field: {key}")
+
+        pack_id = raw_pack["pack_id"]
+        kind = raw_pack["kind"].lower()
+        on_duplicate = raw_pack.get("on_duplicate", "error").lower()
+
+        if pack_id in pack_ids:
+            raise InvalidDataFormatError(f"Duplicate pack_id found: {pack_id}")
+        if kind not in ("quests", "items"):
+            raise InvalidDataFormatError(f"Pack '{pack_id}' has invalid kind: '{kind}'. Must be quests or items.")
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise InvalidDataFormatError(f"Pack '{pack_id}' has invalid on_duplicate: '{on_duplicate}'. Must be one of {', '.join(DUPLICATE_POLICIES)}.")
+
+        pack_ids.add(pack_id)
+        packs.append({
+            "id": pack_id,
+            "kind": kind,
+            "file": os.path.join(base_directory, raw_pack["file"]),
+            "on_duplicate": on_duplicate
+        })
+
+    return packs
+
+def load_packs(manifest_path, workers=4):
+    """
+    Load and merge every quest/item pack listed in a manifest
+    
+    Packs are parsed concurrently through load_all, so each pack file has
+    its own compiled cache and editing one pack only re-parses that pack.
+    Records are then merged in manifest order; when an id already exists
+    the later pack's on_duplicate policy decides:
+    - error: raise InvalidDataFormatError
+    - override: the later pack's record replaces the earlier one
+    - keep: the earlier record is kept
+    
+    Returns: Dictionary {'quests': {...}, 'items': {...}}
+    Raises: InvalidDataFormatError listing every pack that failed to load,
+            or naming the first disallowed duplicate id
+    """
+    packs = load_manifest(manifest_path)
+    records, errors = load_all([(pack["kind"], pack["file"]) for pack in packs], workers)
+
+    if errors:
+        report = "\n".join(f"  {path}: {error}" for path, error in errors.items())
+        raise InvalidDataFormatError(f"Could not load catalog packs:\n{report}")
+
+    merged = {"quests": {}, "items": {}}
+    sources = {"quests": {}, "items": {}}
+
+    for pack in packs:
+        catalog = merged[pack["kind"]]
+        source = sources[pack["kind"]]
+        for record_id, record in records[pack["file"]].items():
+            if record_id in catalog:
+                if pack["on_duplicate"] == "error":
+                    raise InvalidDataFormatError(f"Pack '{pack['id']}' redefines '{record_id}' from pack '{source[record_id]}'.")
+                if pack["on_duplicate"] == "keep":
+                    continue
+            catalog[record_id] = record
+            source[record_id] = pack["id"]
+
+    return merged
 
 def validate_quest_data(quest_dict):
     """
@@ -273,7 +498,7 @@ def validate_item_data(item_dict):
         raise ValueError(f"item '{item_id}' cost must be a non-negative integer. received: {cost}")
 
     effect = item_dict["effect"]
-    if not isinstance(effect, dict) or "stat" not in effect or "value" not in effect:
+    if not isinstance(effect, Mapping) or "stat" not in effect or "value" not in effect:
         raise ValueError(f"item '{item_id}' effect field is malformed. expected {{'stat': str, 'value': int}}")
     
     effect_value = effect["value"]
@@ -282,6 +507,81 @@ def validate_item_data(item_dict):
 
     return True
 
+def validate_catalog_file(filename, kind, report_file=None):
+    """
+    Check a whole quests/items file and report every error in one pass
+    
+    Unlike load_quests/load_items, which stop at the first bad record, this
+    streams the file once, keeps going after each error, and collects them
+    all with the line number they were found on. Memory use is bounded by
+    the set of ids seen (for duplicate detection).
+    
+    Args:
+        filename: Data file to check
+        kind: "quests" or "items"
+        report_file: Optional path to also write the report as JSON
+    
+    Returns: Dictionary {'file', 'kind', 'records', 'valid', 'errors'} where
+             errors is a list of {'line', 'id', 'message'} dictionaries
+    Raises: ValueError if kind is not recognized
+    """
+    builders = {"quests": build_quest_record, "items": build_item_record}
+    validators = {"quests": validate_quest_data, "items": validate_item_data}
+    if kind not in builders:
+        raise ValueError(f"Unknown catalog kind '{kind}'. Must be 'quests' or 'items'.")
+    builder = builders[kind]
+    validator = validators[kind]
+    id_key = "quest_id" if kind == "quests" else "item_id"
+
+    errors = []
+    first_seen = {}
+    record_count = 0
+
+    def add_error(line_number, record_id, message):
+        errors.append({"line": line_number, "id": record_id, "message": message})
+
+    try:
+        for start_line, lines in iter_record_blocks(filename):
+            record_count += 1
+            fields = {}
+            for offset, line in enumerate(lines):
+                try:
+                    fields.update(parse_record_fields([line], start_line + offset))
+                except InvalidDataFormatError as e:
+                    add_error(start_line + offset, None, str(e))
+
+            record_id = fields.get(id_key)
+            try:
+                record = builder(fields)
+                validator(record)
+            except (InvalidDataFormatError, CorruptedDataError, ValueError) as e:
+                add_error(start_line, record_id, str(e))
+                continue
+
+            if record_id in first_seen:
+                add_error(start_line, record_id, f"Duplicate {id_key} '{record_id}' (first defined on line {first_seen[record_id]})")
+            else:
+                first_seen[record_id] = start_line
+    except FileNotFoundError:
+        add_error(None, None, f"Data file not found at: {filename}")
+    except (OSError, UnicodeDecodeError) as e:
+        add_error(None, None, f"Error reading data file: {e}")
+
+    report = {
+        "file": filename,
+        "kind": kind,
+        "records": record_count,
+        "valid": not errors,
+        "errors": errors
+    }
+
+    if report_file is not None:
+        import json
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    return report
+
 def create_default_data_files():
     """
     Create default data files if they don't exist
@@ -359,6 +659,910 @@ def create_default_data_files():
             except IOError as e:
                 print(f"error writing to file '{filepath}': {e}")
 
+# ============================================================================
+# STREAMING RECORD READER
+# ============================================================================
+
+def iter_record_blocks(filename):
+    """
+    Stream blank-line separated blocks from a data file
+    
+    Only the block currently being built is held in memory, so callers can
+    walk arbitrarily large files and stop early by breaking out of the loop.
+    
+    Args:
+        filename: Path to a quests/items style data file
+    
+    Yields: (start_line_number, lines) with each line already stripped
+    Raises: OSError if the file cannot be opened or read
+    """
+    with open(filename, 'r') as f:
+        block = []
+        start_line = 0
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                if block:
+                    yield start_line, block
+                    block = []
+                continue
+            if not block:
+                start_line = line_number
+            block.append(line)
+        if block:
+            yield start_line, block
+
+def parse_record_fields(lines, start_line=None):
+    """
+    Split the "KEY: value" lines of one block into a dictionary
+    
+    Keys are lowercased and both keys and values are stripped. Only the
+    first colon separates key from value, so "EFFECT: strength:5" keeps
+    "strength:5" as its value.
+    
+    Returns: Dictionary of field name -> string value
+    Raises: InvalidDataFormatError if a line has no colon or no key
+    """
+    fields = {}
+    for offset, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+
+        key, sep, value = line.partition(':')
+        key = key.strip().lower()
+        if not sep or not key:
+            location = f" (line {start_line + offset})" if start_line else ""
+            raise InvalidDataFormatError(f"Line format error{location}: '{line}' must be 'KEY: value'.")
+
+        fields[key] = value.strip()
+    return fields
+
+def iter_records(filename):
+    """
+    Stream one parsed block at a time from a data file
+    
+    This is the shared reader under load_quests and load_items. Each block
+    is yielded as a dictionary of lowercase field name -> string value;
+    converting it to a quest or item is left to the caller.
+    
+    Yields: Dictionary of raw fields for one record
+    Raises: InvalidDataFormatError for malformed lines, OSError on read errors
+    """
+    for start_line, lines in iter_record_blocks(filename):
+        yield parse_record_fields(lines, start_line)
+
+# ============================================================================
+# COMPILED CACHE
+# ============================================================================
+
+def get_cache_path(filename):
+    """Return the path of the compiled cache file kept next to filename"""
+    return filename + CACHE_SUFFIX
+
+def _file_digest(filename):
+    """Return the sha1 hex digest of a file's contents"""
+    digest = hashlib.sha1()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_compiled_cache(filename, kind):
+    """
+    Load previously parsed records for filename from its cache file
+    
+    The cache is keyed on the absolute source path, its size, its mtime
+    and a sha1 of its contents. Size is checked first so most edits are
+    rejected without hashing; an unchanged size and mtime still has its
+    digest verified so same-size edits inside one mtime tick are caught.
+    
+    Args:
+        filename: Source text file (e.g. data/items.txt)
+        kind: "quests" or "items", stored in the cache to avoid mixups
+    
+    Returns: Parsed records dictionary, or None if the cache is missing/stale
+    """
+    cache_path = get_cache_path(filename)
+    try:
+        with open(cache_path, 'rb') as f:
+            content = f.read()
+        source_stat = os.stat(filename)
+    except OSError:
+        return None
+
+    # The file starts with a sha1 of the pickle so a damaged cache is never
+    # unpickled (bad bytes can still unpickle into wrong records)
+    checksum, data = content[:CACHE_CHECKSUM_SIZE], content[CACHE_CHECKSUM_SIZE:]
+    if hashlib.sha1(data).digest() != checksum:
+        return None
+    try:
+        cached = pickle.loads(data)
+    except Exception:
+        # Any failure (TypeError, KeyError, MemoryError, ...) just means
+        # rebuild from the text file
+        return None
+
+    if not isinstance(cached, dict) or not isinstance(cached.get("records"), dict):
+        return None
+    if cached.get("version") != CACHE_VERSION or cached.get("kind") != kind:
+        return None
+    if cached.get("path") != os.path.abspath(filename):
+        return None
+    if cached.get("size") != source_stat.st_size:
+        return None
+
+    try:
+        digest = _file_digest(filename)
+    except OSError:
+        return None
+    if cached.get("digest") != digest:
+        return None
+
+    if cached.get("mtime_ns") != source_stat.st_mtime_ns:
+        # Contents are identical (file was only touched), so refresh the
+        # key to skip this branch next time.
+        write_compiled_cache(filename, kind, cached["records"], digest)
+
+    return cached["records"]
+
+def write_compiled_cache(filename, kind, records, digest=None):
+    """
+    Write parsed records for filename to its cache file
+    
+    The cache is written to a temporary file and moved into place so a
+    crash never leaves a half written cache behind. Failing to write the
+    cache (read-only data directory, etc.) is not an error.
+    
+    Returns: True if the cache was written, False otherwise
+    """
+    cache_path = get_cache_path(filename)
+    temp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        source_stat = os.stat(filename)
+        if digest is None:
+            digest = _file_digest(filename)
+        payload = {
+            "version": CACHE_VERSION,
+            "kind": kind,
+            "path": os.path.abspath(filename),
+            "size": source_stat.st_size,
+            "mtime_ns": source_stat.st_mtime_ns,
+            "digest": digest,
+            "records": records
+        }
+        data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(temp_path, 'wb') as f:
+            f.write(hashlib.sha1(data).digest())
+            f.write(data)
+        os.replace(temp_path, cache_path)
+        return True
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+def clear_compiled_cache(filename):
+    """
+    Delete the compiled cache for filename if one exists
+    
+    Returns: True if a cache file was removed
+    """
+    cache_path = get_cache_path(filename)
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+        return True
+    return False
+
+def _load_with_cache(filename, kind, parser):
+    """Return cached records for filename, parsing and caching on a miss"""
+    records = load_compiled_cache(filename, kind)
+    if records is not None:
+        return records
+
+    # Hash before parsing so an edit made while we parse can't end up
+    # cached under the new contents' key.
+    try:
+        digest = _file_digest(filename)
+    except OSError:
+        digest = None
+
+    records = parser(filename)
+    if digest is not None:
+        write_compiled_cache(filename, kind, records, digest)
+    return records
+
+# ============================================================================
+# LAZY ITEM CATALOG
+# ============================================================================
+
+def build_item_offset_index(buffer):
+    """
+    Scan an items file buffer for record boundaries
+    
+    Args:
+        buffer: bytes or mmap of an items.txt style file
+    
+    Returns: Dictionary {item_id: (start_offset, end_offset)}
+    Raises: ValueError if a block has no ITEM_ID or an id is duplicated
+    """
+    index = {}
+    size = len(buffer)
+    position = 0
+    block_start = None
+    block_id = None
+
+    def finish_block(end):
+        if block_id is None:
+            raise ValueError(f"Item block at byte {block_start} is missing required field: item_id")
+        if block_id in index:
+            raise ValueError(f"Duplicate item_id found: {block_id}")
+        index[block_id] = (block_start, end)
+
+    while position < size:
+        line_end = buffer.find(b'\n', position)
+        if line_end == -1:
+            line_end = size
+        line = buffer[position:line_end].strip()
+
+        if not line:
+            if block_start is not None:
+                finish_block(position)
+                block_start = None
+                block_id = None
+        else:
+            if block_start is None:
+                block_start = position
+            key, sep, value = line.partition(b':')
+            if sep and key.strip().lower() == b'item_id':
+                block_id = value.strip().decode()
+
+        position = line_end + 1
+
+    if block_start is not None:
+        finish_block(size)
+
+    return index
+
+def load_item_offset_index(filename):
+    """
+    Load the cached offset index for filename, rebuilding it if stale
+    
+    Unlike the compiled cache this is keyed on path, size and mtime only,
+    since hashing the file would make startup O(file size) again.
+    
+    Returns: Dictionary {item_id: (start_offset, end_offset)}
+    """
+    index_path = filename + INDEX_SUFFIX
+    source_stat = os.stat(filename)
+    key = (CACHE_VERSION, os.path.abspath(filename), source_stat.st_size, source_stat.st_mtime_ns)
+
+    try:
+        with open(index_path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        content = b""
+
+    # Same sha1 prefix as the compiled cache (this hashes the index, not the
+    # source file, so it stays cheap)
+    data = content[CACHE_CHECKSUM_SIZE:]
+    if content and hashlib.sha1(data).digest() == content[:CACHE_CHECKSUM_SIZE]:
+        try:
+            cached = pickle.loads(data)
+        except Exception:
+            cached = None
+        if isinstance(cached, dict) and cached.get("key") == key and isinstance(cached.get("offsets"), dict):
+            return cached["offsets"]
+
+    if source_stat.st_size == 0:
+        offsets = {}
+    else:
+        with open(filename, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offsets = build_item_offset_index(mm)
+
+    temp_path = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        data = pickle.dumps({"key": key, "offsets": offsets}, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(temp_path, 'wb') as f:
+            f.write(hashlib.sha1(data).digest())
+            f.write(data)
+        os.replace(temp_path, index_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return offsets
+
+class LazyItemCatalog(Mapping):
+    """
+    Read-only {item_id: item_dict} mapping backed by a memory-mapped file
+    
+    Only the item_id -> byte offset index is loaded up front. Each item is
+    parsed with build_item_record the first time it is looked up and kept
+    afterwards, so it can be passed anywhere an item_data dictionary from
+    load_items is expected (use_item, equip_weapon, purchase_item, ...).
+    """
+
+    def __init__(self, filename="data/items.txt"):
+        if not os.path.exists(filename):
+            raise FileNotFoundError(f"Item data file not found at: {filename}")
+
+        self.filename = filename
+        self._offsets = load_item_offset_index(filename)
+        self._records = {}
+        self._file = None
+        self._mmap = None
+
+        if self._offsets:
+            self._file = open(filename, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __getitem__(self, item_id):
+        record = self._records.get(item_id)
+        if record is not None:
+            return record
+
+        start, end = self._offsets[item_id]
+        if self._mmap is None:
+            raise ValueError(f"Item catalog for {self.filename} is closed.")
+        lines = self._mmap[start:end].decode().splitlines()
+        record = build_item_record(parse_record_fields(lines))
+        self._records[item_id] = record
+        return record
+
+    def __contains__(self, item_id):
+        return item_id in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def loaded_count(self):
+        """Return how many items have been parsed so far"""
+        return len(self._records)
+
+    def close(self):
+        """Release the memory map and file handle"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+# ============================================================================
+# QUEST PREREQUISITE GRAPH
+# ============================================================================
+
+class QuestGraph:
+    """
+    Precompiled prerequisite graph for a quest catalog from load_quests
+    
+    Each quest has at most one prerequisite, so the quests form a forest.
+    Building the graph does one linear walk of that forest and records:
+    - topological_order: every quest after its prerequisite
+    - depth: number of prerequisites above each quest
+    - entry/exit numbers from the walk, so "is A ultimately required by B"
+      is two integer comparisons instead of walking the chain
+    
+    Cycles are rejected here, once, instead of at query time. Quests whose
+    prerequisite is not in the catalog are treated as roots and listed in
+    missing_prerequisites (the missing id still shows up in
+    prerequisite() and at the start of prerequisite_chain()).
+    
+    Raises: InvalidDataFormatError if the prerequisites contain a cycle
+    """
+
+    def __init__(self, quest_data_dict):
+        self.parent = {}
+        self.missing_prerequisites = {}
+        children = {}
+        roots = []
+
+        for quest_id, quest in quest_data_dict.items():
+            prereq_id = quest.get("prerequisite")
+            if prereq_id is None or prereq_id == "NONE":
+                roots.append(quest_id)
+                continue
+            if prereq_id not in quest_data_dict:
+                self.missing_prerequisites[quest_id] = prereq_id
+                roots.append(quest_id)
+                continue
+            self.parent[quest_id] = prereq_id
+            children.setdefault(prereq_id, []).append(quest_id)
+
+        self.topological_order = []
+        self.depth = {}
+        self._entry = {}
+        self._exit = {}
+        clock = 0
+
+        for root in roots:
+            self.depth[root] = 0
+            stack = [(root, False)]
+            while stack:
+                quest_id, finished = stack.pop()
+                if finished:
+                    self._exit[quest_id] = clock
+                    clock += 1
+                    continue
+
+                self._entry[quest_id] = clock
+                clock += 1
+                self.topological_order.append(quest_id)
+                stack.append((quest_id, True))
+                for child_id in children.get(quest_id, ()):
+                    self.depth[child_id] = self.depth[quest_id] + 1
+                    stack.append((child_id, False))
+
+        if len(self.topological_order) != len(quest_data_dict):
+            # Anything not reached from a root sits on or behind a cycle
+            start = next(q for q in quest_data_dict if q not in self._entry)
+            seen = {}   # quest_id -> position in the walk
+            path = []
+            while start not in seen:
+                seen[start] = len(path)
+                path.append(start)
+                start = self.parent[start]
+            cycle = path[seen[start]:] + [start]
+            raise InvalidDataFormatError(f"Circular quest prerequisites: {' -> '.join(cycle)}")
+
+    def __contains__(self, quest_id):
+        return quest_id in self._entry
+
+    def __len__(self):
+        return len(self.topological_order)
+
+    def prerequisite(self, quest_id):
+        """Return quest_id's direct prerequisite (even if missing), or None"""
+        return self.parent.get(quest_id) or self.missing_prerequisites.get(quest_id)
+
+    def is_required_for(self, prereq_id, quest_id):
+        """
+        Check whether prereq_id is somewhere in quest_id's prerequisite chain
+        
+        Returns: True if prereq_id must be completed (directly or not) first
+        """
+        if prereq_id == quest_id or prereq_id not in self._entry or quest_id not in self._entry:
+            return False
+        return (self._entry[prereq_id] < self._entry[quest_id]
+                and self._exit[quest_id] < self._exit[prereq_id])
+
+    def prerequisite_chain(self, quest_id):
+        """
+        Get the full chain of prerequisites for a quest, O(chain length)
+        
+        Returns: List of quest IDs in order [earliest_prereq, ..., quest_id]
+        Raises: QuestNotFoundError if quest doesn't exist
+        """
+        if quest_id not in self._entry:
+            raise QuestNotFoundError(f"Quest ID '{quest_id}' not found in quest graph.")
+
+        chain = [quest_id]
+        while chain[-1] in self.parent:
+            chain.append(self.parent[chain[-1]])
+        if chain[-1] in self.missing_prerequisites:
+            chain.append(self.missing_prerequisites[chain[-1]])
+        chain.reverse()
+        return chain
+
+# ============================================================================
+# SECONDARY ITEM INDEXES
+# ============================================================================
+
+class ItemIndex:
+    """
+    Secondary indexes over an item catalog from load_items
+    
+    - type -> item ids
+    - effect stat -> item ids
+    - items sorted by cost, for bisect range queries
+    
+    Lookups are O(log n + k) instead of a scan of every item. Call
+    apply_diff with a CatalogWatcher diff to keep it in sync on reload.
+    """
+
+    def __init__(self, item_data=None):
+        self._by_type = {}
+        self._by_stat = {}
+        self._costs = []
+        self._cost_ids = []
+        self._entries = {}
+
+        if item_data:
+            for item_id, item in item_data.items():
+                self._add(item_id, item, keep_sorted=False)
+            # One stable sort instead of an O(n) list.insert per item;
+            # ties keep catalog order, as bisect_right insertion would
+            order = sorted(range(len(self._costs)), key=self._costs.__getitem__)
+            self._costs = [self._costs[position] for position in order]
+            self._cost_ids = [self._cost_ids[position] for position in order]
+
+    def _add(self, item_id, item, keep_sorted=True):
+        from inventory_system import get_item_effect
+
+        item_type = item.get("type")
+        effect = item.get("effect")
+        stat_name = get_item_effect(effect)[0] if effect else None
+        cost = item.get("cost", 0)
+
+        self._by_type.setdefault(item_type, {})[item_id] = None
+        if stat_name:
+            self._by_stat.setdefault(stat_name, {})[item_id] = None
+
+        if keep_sorted:
+            position = bisect.bisect_right(self._costs, cost)
+            self._costs.insert(position, cost)
+            self._cost_ids.insert(position, item_id)
+        else:
+            self._costs.append(cost)
+            self._cost_ids.append(item_id)
+
+        self._entries[item_id] = (item_type, stat_name, cost)
+
+    def _remove(self, item_id):
+        entry = self._entries.pop(item_id, None)
+        if entry is None:
+            return
+        item_type, stat_name, cost = entry
+
+        self._by_type[item_type].pop(item_id, None)
+        if stat_name:
+            self._by_stat[stat_name].pop(item_id, None)
+
+        position = bisect.bisect_left(self._costs, cost)
+        while self._cost_ids[position] != item_id:
+            position += 1
+        del self._costs[position]
+        del self._cost_ids[position]
+
+    def copy(self):
+        """Return an independent copy (e.g. to apply_diff off to the side)"""
+        other = ItemIndex()
+        other._by_type = {item_type: dict(ids) for item_type, ids in self._by_type.items()}
+        other._by_stat = {stat_name: dict(ids) for stat_name, ids in self._by_stat.items()}
+        other._costs = list(self._costs)
+        other._cost_ids = list(self._cost_ids)
+        other._entries = dict(self._entries)
+        return other
+
+    def apply_diff(self, item_data, diff):
+        """
+        Update the indexes after a reload
+        
+        Args:
+            item_data: The new item catalog
+            diff: {'added': [...], 'removed': [...], 'changed': [...]}
+        """
+        for item_id in diff["removed"] + diff["changed"]:
+            self._remove(item_id)
+        for item_id in diff["added"] + diff["changed"]:
+            self._add(item_id, item_data[item_id])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def by_type(self, item_type):
+        """Return ids of every item of item_type"""
+        return list(self._by_type.get(item_type, ()))
+
+    def by_effect_stat(self, stat_name):
+        """Return ids of every item whose effect changes stat_name"""
+        return list(self._by_stat.get(stat_name, ()))
+
+    def in_cost_range(self, min_cost, max_cost):
+        """Return ids of items with min_cost <= cost <= max_cost, cheapest first"""
+        start = bisect.bisect_left(self._costs, min_cost)
+        end = bisect.bisect_right(self._costs, max_cost)
+        return self._cost_ids[start:end]
+
+# ============================================================================
+# HOT RELOAD
+# ============================================================================
+
+RECORD_BUILDERS = {"quests": build_quest_record, "items": build_item_record}
+
+class CatalogWatcher:
+    """
+    Poll a quests/items file and reload it incrementally when it changes
+    
+    Every block of the file is hashed. On reload, blocks whose hash was
+    seen last time reuse the already built record and only new or edited
+    blocks are parsed again. The new catalog is built completely before it
+    replaces the old one, and on_change(records, diff) is called with the
+    new dictionary and a diff of added/removed/changed ids.
+    
+    If the edited file is invalid (or on_change raises) the error is
+    stored in last_error and the old catalog stays in place, so the next
+    poll tries the same change again (with the same diff) until it
+    succeeds.
+    """
+
+    def __init__(self, filename, kind, on_change=None):
+        if kind not in RECORD_BUILDERS:
+            raise ValueError(f"Unknown catalog kind '{kind}'. Must be 'quests' or 'items'.")
+
+        self.filename = filename
+        self.kind = kind
+        self.on_change = on_change
+        self.records = {}
+        self.last_error = None
+        self._block_records = {}
+        self._record_hashes = {}
+        self._signature = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+        self.reload()
+
+    def _file_signature(self):
+        source_stat = os.stat(self.filename)
+        return (source_stat.st_mtime_ns, source_stat.st_size)
+
+    def reload(self):
+        """
+        Re-read the file, reusing records for blocks that did not change
+        
+        Returns: Diff dictionary {'added': [...], 'removed': [...], 'changed': [...]}
+        Raises: Any loading error; the current catalog is left untouched
+        """
+        diff, state = self._build()
+        self._install(state)
+        return diff
+
+    def _build(self):
+        """
+        Parse the file into a new catalog without installing it
+        
+        Returns: Tuple of (diff, state) where state is passed to _install
+        """
+        builder = RECORD_BUILDERS[self.kind]
+        signature = self._file_signature()
+
+        records = {}
+        record_hashes = {}
+        block_records = {}
+
+        for start_line, lines in iter_record_blocks(self.filename):
+            block_hash = hashlib.sha1("\n".join(lines).encode()).hexdigest()
+            record = self._block_records.get(block_hash)
+            if record is None:
+                record = builder(parse_record_fields(lines, start_line))
+
+            record_id = record["id"]
+            if record_id in records:
+                raise InvalidDataFormatError(f"Duplicate {self.kind[:-1]} id found: {record_id}")
+
+            records[record_id] = record
+            record_hashes[record_id] = block_hash
+            block_records[block_hash] = record
+
+        old_hashes = self._record_hashes
+        diff = {
+            "added": sorted(set(record_hashes) - set(old_hashes)),
+            "removed": sorted(set(old_hashes) - set(record_hashes)),
+            "changed": sorted(
+                record_id for record_id, block_hash in record_hashes.items()
+                if record_id in old_hashes and old_hashes[record_id] != block_hash
+            )
+        }
+
+        state = {
+            "records": records,
+            "record_hashes": record_hashes,
+            "block_records": block_records,
+            "signature": signature
+        }
+        return diff, state
+
+    def _install(self, state):
+        """Make a catalog from _build the current one"""
+        self.records = state["records"]
+        self._record_hashes = state["record_hashes"]
+        self._block_records = state["block_records"]
+        self._signature = state["signature"]
+        self.last_error = None
+
+    def poll(self):
+        """
+        Reload the file if its mtime or size changed since the last load
+        
+        Returns: Diff dictionary if the catalog was replaced, otherwise None
+        """
+        try:
+            if self._file_signature() == self._signature:
+                return None
+            diff, state = self._build()
+            if self.on_change is not None:
+                self.on_change(state["records"], diff)
+        except Exception as e:
+            # Also catches on_change errors, which would otherwise end the
+            # background thread without a trace. Nothing is installed, so
+            # the next poll retries against the same baseline.
+            self.last_error = e
+            return None
+
+        self._install(state)
+        return diff
+
+    def start(self, interval=2.0):
+        """Poll in a background daemon thread every interval seconds"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+
+        def run():
+            while not self._stop_event.wait(interval):
+                self.poll()
+
+        self._thread = threading.Thread(target=run, name=f"CatalogWatcher({self.filename})", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background polling thread"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+# ============================================================================
+# SHARED MEMORY CATALOGS
+# ============================================================================
+
+SHARED_CATALOG_MAGIC = b"QCCAT1"
+SHARED_CATALOG_HEADER = struct.Struct("<6sQ")
+
+# Blocks published by this process (registered with its resource tracker)
+_published_blocks = set()
+
+class SharedCatalog(Mapping):
+    """
+    Read-only quest/item catalog stored in multiprocessing shared memory
+    
+    A parent process parses the catalog once and calls publish(); workers
+    attach with SharedCatalog(name) and read records straight out of the
+    shared block. Only the id -> (offset, length) index is copied into
+    each worker up front; a record is unpickled the first time it is
+    looked up, so per-worker catalog memory stays close to zero.
+    
+    Layout: magic, index length, pickled index, then one pickled record
+    per id.
+    """
+
+    def __init__(self, name, _shm=None):
+        self._owner = _shm is not None
+        self._shm = _shm if _shm is not None else _attach_shared_memory(name)
+        self.name = self._shm.name
+        self._buffer = self._shm.buf.toreadonly()
+        # The view pins the mapping, so it has to be released before the
+        # block can close (even when the catalog is just garbage collected)
+        self._finalizer = weakref.finalize(self, _release_shared_memory, self._buffer, self._shm)
+
+        magic, index_length = SHARED_CATALOG_HEADER.unpack_from(self._buffer, 0)
+        if magic != SHARED_CATALOG_MAGIC:
+            self.close()
+            raise CorruptedDataError(f"Shared memory block '{name}' is not a published catalog.")
+
+        start = SHARED_CATALOG_HEADER.size
+        self._index = pickle.loads(self._buffer[start:start + index_length])
+        # Record offsets in the index are relative to the end of the index
+        self._data_start = start + index_length
+        self._records = {}
+
+    @classmethod
+    def publish(cls, records, name=None):
+        """
+        Copy a parsed catalog into a new shared memory block
+        
+        Args:
+            records: Dictionary from load_quests or load_items
+            name: Optional shared memory name (generated if None)
+        
+        Returns: SharedCatalog owning the block; pass .name to workers and
+                 call unlink() once every worker is done
+        """
+        from multiprocessing import shared_memory
+
+        blobs = {record_id: pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+                 for record_id, record in records.items()}
+
+        index = {}
+        offset = 0
+        for record_id, blob in blobs.items():
+            index[record_id] = (offset, len(blob))
+            offset += len(blob)
+        index_blob = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+
+        data_start = SHARED_CATALOG_HEADER.size + len(index_blob)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(1, data_start + offset))
+        SHARED_CATALOG_HEADER.pack_into(shm.buf, 0, SHARED_CATALOG_MAGIC, len(index_blob))
+        shm.buf[SHARED_CATALOG_HEADER.size:data_start] = index_blob
+        for record_id, blob in blobs.items():
+            record_offset = data_start + index[record_id][0]
+            shm.buf[record_offset:record_offset + len(blob)] = blob
+
+        _published_blocks.add(shm.name)
+        return cls(shm.name, _shm=shm)
+
+    def __getitem__(self, record_id):
+        record = self._records.get(record_id)
+        if record is not None:
+            return record
+
+        offset, length = self._index[record_id]
+        if self._buffer is None:
+            raise ValueError(f"Shared catalog '{self.name}' is closed.")
+        start = self._data_start + offset
+        record = pickle.loads(self._buffer[start:start + length])
+        self._records[record_id] = record
+        return record
+
+    def __contains__(self, record_id):
+        return record_id in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def close(self):
+        """Detach from the shared memory block"""
+        self._buffer = None
+        self._finalizer()
+
+    def unlink(self):
+        """Close and destroy the shared memory block (publisher only)"""
+        self.close()
+        if self._owner:
+            self._shm.unlink()
+            _published_blocks.discard(self.name)
+            self._owner = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
+
+def _release_shared_memory(buffer, shm):
+    """Release a SharedCatalog's view, then close its block"""
+    buffer.release()
+    shm.close()
+
+def _attach_shared_memory(name):
+    """Attach to an existing block without letting this process's exit remove it"""
+    from multiprocessing import shared_memory
+
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # track= only exists on Python 3.13+. Before that, attaching
+        # registers the block with this process's resource tracker, which
+        # unlinks it when this process exits. The publisher's process and
+        # its multiprocessing children share the tracker that already holds
+        # the publisher's registration, so only other processes unregister.
+        import multiprocessing
+        from multiprocessing import resource_tracker
+
+        shm = shared_memory.SharedMemory(name=name)
+        if multiprocessing.parent_process() is None and shm.name not in _published_blocks:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -374,27 +1578,10 @@ def parse_quest_block(lines):
     Raises: InvalidDataFormatError if parsing fails
     """
     # TODO: Implement parsing logic
-    # Split each line on ": " to get key-value pairs
+    # Split each line on ":" to get key-value pairs (see parse_record_fields)
     # Convert numeric strings to integers
     # Handle parsing errors gracefully
-    quest_data = {}
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        if ': ' not in line:
-            raise ValueError(f"Invalid quest format. Line must contain ': ' separator: '{line}'")
-        
-        key, value = line.split(': ', 1)
-        key = key.strip().lower()
-        value = value.strip()
-        
-        if not key:
-            raise ValueError(f"Invalid quest format. Key is missing on line: '{line}'")
-
-        quest_data[key] = value
+    quest_data = parse_record_fields(lines)
 
     quest_id = quest_data.get('quest_id', 'unknown quest')
  
@@ -439,24 +1626,7 @@ def parse_item_block(lines):
     Raises: InvalidDataFormatError if parsing fails
     """
     # TODO: Implement parsing logic
-    item_data = {}
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-
-        if ': ' not in line:
-            raise ValueError(f"invalid item format. line must contain ': ' separator: '{line}'")
-        
-        key, value = line.split(': ', 1)
-        key = key.strip().lower() 
-        value = value.strip()
-        
-        if not key:
-            raise ValueError(f"invalid item format. key is missing on line: '{line}'")
-
-        item_data[key] = value
+    item_data = parse_record_fields(lines)
 
     item_id = item_data.get('item_id', 'unknown item')
     
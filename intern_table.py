@@ -0,0 +1,32 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Intern Table Module
+
+Shared table of item ids, quest ids and stat names. Every subsystem that
+creates one of these strings (game_data when loading catalogs,
+character_manager when loading saves, inventory_system when adding
+items) passes it through intern_id, so equal ids are the same object.
+That saves memory across many loaded characters and lets `in` checks on
+inventories and quest lists succeed on the identity test before
+comparing characters.
+"""
+
+_table = {}
+
+def intern_id(value):
+    """
+    Return the shared copy of an id string
+
+    Non-string values (e.g. None) are returned unchanged.
+    """
+    if type(value) is not str:
+        return value
+    return _table.setdefault(value, value)
+
+def intern_ids(values):
+    """Return a new list with every id in values interned"""
+    return [intern_id(value) for value in values]
+
+def table_size():
+    """Return how many distinct ids are in the table"""
+    return len(_table)
@@ -9,6 +9,9 @@ AI Usage: [Document any AI assistance used]
 This module handles inventory management, item usage, and equipment.
 """
 
+from functools import lru_cache
+from collections.abc import Mapping
+from intern_table import intern_id
 from custom_exceptions import (
     InventoryFullError,
     ItemNotFoundError,
@@ -45,7 +48,7 @@ def add_item_to_inventory(character, item_id):
     if len(inventory) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError(f"{character['name']}'s inventory is full. Max capacity: {MAX_INVENTORY_SIZE}")
     
-    inventory.append(item_id)
+    inventory.append(intern_id(item_id))
     return True
 
 def remove_item_from_inventory(character, item_id):
@@ -164,13 +167,11 @@ def use_item(character, item_id, item_data):
     effect_str = item.get('effect', "")
 
     if not effect_str:
-        character['inventory'].remoce(item_id)
+        character['inventory'].remove(item_id)
         return f"{character['name']} used the {item.get('name', item_id)}, but nothing happened."
     
     try:
-        stat_name, value_str = effect_str.split(':')
-        stat_name = stat_name.strip()
-        value = int(value_str.strip())
+        stat_name, value = get_item_effect(effect_str)
     except ValueError:
         character['inventory'].remove(item_id)
         return f"Warning: Item '{item.get('name', item_id)}' has an invalid effect format: '{effect_str}'. It was consumed."
@@ -246,9 +247,8 @@ def equip_weapon(character, item_id, item_data):
 
         if old_weapon_effect_str:
             try:
-                stat_name, value_str = old_weapon_effect_str.split(':')
-                stat_name = stat_name.strip()
-                value = int(value_str.strip()) * -1
+                stat_name, value = get_item_effect(old_weapon_effect_str)
+                value = -value
             except ValueError:
                 print(f"Warning: Old weapon effect format invalid: '{old_weapon_effect_str}'. Skipping stat change.")
                 value = 0
@@ -263,9 +263,7 @@ def equip_weapon(character, item_id, item_data):
 
         if new_weapon_effect_str:
             try:
-                stat_name, value_str = new_weapon_effect_str.split(':')
-                stat_name = stat_name.strip()
-                value = int(value_str.strip()) * 1
+                stat_name, value = get_item_effect(new_weapon_effect_str)
             except ValueError:
                 print(f"Warning: New weapon effect format invalid: '{new_weapon_effect_str}'. Skipping stat change.")
                 value = 0
@@ -333,9 +331,8 @@ def equip_armor(character, item_id, item_data):
 
         if old_armor_effect_str:
             try:
-                stat_name, value_str = old_armor_effect_str.split(':')
-                stat_name = stat_name.strip()
-                value = int(value_str.strip()) * -1
+                stat_name, value = get_item_effect(old_armor_effect_str)
+                value = -value
             except ValueError:
                 print(f"Warning: Old armor effect format invalid: '{old_armor_effect_str}'. Skipping stat change.")
                 value = 0
@@ -359,9 +356,7 @@ def equip_armor(character, item_id, item_data):
 
     if new_armor_effect_str:
         try:
-            stat_name, value_str = new_armor_effect_str.split(':')
-            stat_name = stat_name.strip()
-            value = int(value_str.strip()) * 1
+            stat_name, value = get_item_effect(new_armor_effect_str)
         except ValueError:
             print(f"Warning: New armor effect format invalid: '{new_armor_effect_str}'. Skipping stat change.")
             value = 0
@@ -489,7 +484,7 @@ def purchase_item(character, item_id, item_data):
     
     character['gold'] = character_gold - cost
 
-    inventory.append(item_id)
+    inventory.append(intern_id(item_id))
     character['inventory'] = inventory
     return True
 
@@ -540,6 +535,25 @@ def sell_item(character, item_id, item_data):
 # HELPER FUNCTIONS
 # ============================================================================
 
+def get_item_effect(effect):
+    """
+    Get (stat_name, value) for an item's effect without re-parsing it
+    
+    Args:
+        effect: Compiled effect from game_data.load_items (an ItemEffect or
+                {'stat': ..., 'value': ...} dict), or a legacy "stat:value"
+                string
+    
+    Returns: Tuple of (stat_name, value)
+    Raises: ValueError if the effect is malformed
+    """
+    if isinstance(effect, Mapping):
+        try:
+            return effect['stat'], effect['value']
+        except KeyError:
+            raise ValueError(f"Effect must have 'stat' and 'value'. Found: {effect}")
+    return _parse_effect_string(effect)
+
 def parse_item_effect(effect_string):
     """
     Parse item effect string into stat name and value
@@ -553,6 +567,11 @@ def parse_item_effect(effect_string):
     # TODO: Implement effect parsing
     # Split on ":"
     # Convert value to integer
+    return _parse_effect_string(effect_string)
+
+@lru_cache(maxsize=1024)
+def _parse_effect_string(effect_string):
+    """Parse "stat_name:value" once per distinct string (see parse_item_effect)"""
     if not effect_string:
         raise ValueError("Effect string cannot be empty.")
     
@@ -572,7 +591,7 @@ def parse_item_effect(effect_string):
     except ValueError:
         raise ValueError(f"Value '{value_str}' in effect string must be an integer.")
     
-    return (stat_name, value)
+    return (intern_id(stat_name), value)
 
 def apply_stat_effect(character, stat_name, value):
     """
@@ -0,0 +1,106 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Item Table Module
+
+This module stores the item catalog as parallel NumPy arrays so bulk
+queries (shop listings, balance checks, "what can I afford") are
+vectorized instead of looping over item dictionaries.
+
+NumPy is optional for the rest of the game; it is only needed here.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from game_data import VALID_ITEM_TYPES
+from inventory_system import get_item_effect
+
+# ============================================================================
+# ITEM TABLE
+# ============================================================================
+
+class ItemTable:
+    """
+    Columnar view of an item catalog from game_data.load_items
+
+    Columns (one entry per item, same order as ids):
+    - cost: item cost
+    - type_code: index into VALID_ITEM_TYPES
+    - stat_code: index into stat_names
+    - effect_value: effect amount
+
+    Raises: ImportError if NumPy is not installed
+    """
+
+    def __init__(self, item_data):
+        if np is None:
+            raise ImportError("ItemTable requires NumPy. Install it with 'pip install numpy'.")
+
+        count = len(item_data)
+        self.ids = np.empty(count, dtype=object)
+        self.cost = np.empty(count, dtype=np.int64)
+        self.type_code = np.empty(count, dtype=np.int8)
+        self.stat_code = np.empty(count, dtype=np.int16)
+        self.effect_value = np.empty(count, dtype=np.int64)
+        self.stat_names = []
+
+        stat_codes = {}
+        for row, (item_id, item) in enumerate(item_data.items()):
+            item_type = item.get("type")
+            if item_type not in VALID_ITEM_TYPES:
+                raise ValueError(f"Item '{item_id}' has invalid type: '{item_type}'.")
+
+            effect = item.get("effect")
+            stat_name, value = get_item_effect(effect) if effect else ("", 0)
+            if stat_name not in stat_codes:
+                stat_codes[stat_name] = len(self.stat_names)
+                self.stat_names.append(stat_name)
+
+            self.ids[row] = item_id
+            self.cost[row] = item.get("cost", 0)
+            self.type_code[row] = VALID_ITEM_TYPES.index(item_type)
+            self.stat_code[row] = stat_codes[stat_name]
+            self.effect_value[row] = value
+
+        self._stat_codes = stat_codes
+
+    def __len__(self):
+        return len(self.ids)
+
+    def affordable(self, gold):
+        """
+        Get every item costing at most gold
+
+        Returns: List of item ids
+        """
+        return self.ids[self.cost <= gold].tolist()
+
+    def by_type(self, item_type):
+        """
+        Get every item of one type (weapon, armor or consumable)
+
+        Returns: List of item ids
+        Raises: ValueError if item_type is not valid
+        """
+        if item_type not in VALID_ITEM_TYPES:
+            raise ValueError(f"Invalid item type: '{item_type}'. Must be one of {', '.join(VALID_ITEM_TYPES)}.")
+        return self.ids[self.type_code == VALID_ITEM_TYPES.index(item_type)].tolist()
+
+    def top_k_by_effect(self, stat_name, k):
+        """
+        Get the k items with the largest effect on stat_name
+
+        Returns: List of item ids, strongest first
+        """
+        code = self._stat_codes.get(stat_name)
+        if code is None or k <= 0:
+            return []
+
+        rows = np.flatnonzero(self.stat_code == code)
+        if len(rows) > k:
+            # argpartition finds the top k in O(n); only those k get sorted
+            rows = rows[np.argpartition(-self.effect_value[rows], k - 1)[:k]]
+        rows = rows[np.argsort(-self.effect_value[rows], kind="stable")]
+        return self.ids[rows].tolist()
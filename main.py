@@ -10,14 +10,40 @@ This is the main game file that ties all modules together.
 Demonstrates module integration and complete game flow.
 """
 
-# Import all our custom modules
-import character_manager
-import inventory_system
-import quest_handler
-import combat_system
-import game_data
+import sys
+import time
+import importlib.util
 from custom_exceptions import *
 
+# Subsystem modules are imported lazily: each name below is a placeholder
+# module that runs the real import the first time one of its attributes is
+# used, so the main menu can be shown before every subsystem has loaded.
+SUBSYSTEM_MODULES = ["character_manager", "inventory_system", "quest_handler", "combat_system", "game_data"]
+
+def lazy_import(module_name):
+    """
+    Return module_name without executing it until it is first used
+    
+    Returns: The already imported module, or a lazily loading placeholder
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.find_spec(module_name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    loader.exec_module(module)
+    return module
+
+# Import all our custom modules
+character_manager = lazy_import("character_manager")
+inventory_system = lazy_import("inventory_system")
+quest_handler = lazy_import("quest_handler")
+combat_system = lazy_import("combat_system")
+game_data = lazy_import("game_data")
+
 # ============================================================================
 # GAME STATE
 # ============================================================================
@@ -26,7 +52,13 @@ from custom_exceptions import *
 current_character = None
 all_quests = {}
 all_items = {}
+item_lookup = None
+quest_graph = None
 game_running = False
+data_watchers = []
+
+QUEST_FILE = "data/quests.txt"
+ITEM_FILE = "data/items.txt"
 
 # ============================================================================
 # MAIN MENU
@@ -544,37 +576,105 @@ def quest_menu():
     #   6. Complete Quest (for testing)
     #   7. Back
     # Handle exceptions from quest_handler
+    # Quest order, prerequisites and chains come from quest_graph (built
+    # once in load_game_data) instead of being worked out per lookup.
     char = current_character
     
-    def display_quests(quest_list, title):
-        """Displays a list of quests based on their status."""
+    def quest_order():
+        """All quest ids, prerequisites first"""
+        if quest_graph is not None:
+            return quest_graph.topological_order
+        return list(all_quests)
+    
+    def display_quests(quest_ids, title):
+        """Displays a numbered list of quests and returns their ids."""
         print(f"\n=== {title} ===")
-        if not quest_list:
+        if not quest_ids:
             print("No quests to display in this list.")
             return []
 
-        indexed_quests = []
-        print("No. | Title                   | Status/Progress")
-        print("----|-------------------------|-----------------")
+        print("No. | Title                   | Level | Rewards")
+        print("----|-------------------------|-------|-----------------")
         
-        for i, (quest_id, data) in enumerate(quest_list):
-            index = i + 1
+        for index, quest_id in enumerate(quest_ids, start=1):
             quest_info = all_quests.get(quest_id, {})
             title_str = quest_info.get("title", "UNKNOWN QUEST")[:23].ljust(23)
+            rewards = f"{quest_info.get('reward_xp', 0)} XP, {quest_info.get('reward_gold', 0)}G"
+            print(f"{index:<3} | {title_str} | {quest_info.get('required_level', 1):<5} | {rewards}")
             
-            status_str = "Completed"
-            if title == "Active Quests":
-                required = quest_info.get("required_progress", 1)
-                status_str = f"{data['progress']}/{required}"
-                if data['progress'] >= required:
-                    status_str += " (READY)"
-            elif title == "Available Quests":
-                status_str = f"Reward: {quest_info.get('reward_gold', 0)}G"
-            
-            print(f"{index:<3} | {title_str} | {status_str}")
-            indexed_quests.append(quest_id)
-            
-        return indexed_quests
+        return list(quest_ids)
+    
+    def pick_quest(quest_ids, title):
+        """Show quest_ids and return the one the player picks (or None)."""
+        if not display_quests(quest_ids, title):
+            return None
+        choice_input = input("Enter quest number (or 0 to cancel): ").strip()
+        if not choice_input.isdigit() or not 1 <= int(choice_input) <= len(quest_ids):
+            return None
+        return quest_ids[int(choice_input) - 1]
+    
+    while True:
+        print("\n=== QUEST MENU ===")
+        print("1. View Active Quests")
+        print("2. View Available Quests")
+        print("3. View Completed Quests")
+        print("4. Accept Quest")
+        print("5. Abandon Quest")
+        print("6. Complete Quest (for testing)")
+        print("7. Back")
+        choice = input("Enter your choice (1-7): ").strip()
+        
+        active = char.get('active_quests', [])
+        completed = char.get('completed_quests', [])
+        available = [
+            quest_id for quest_id in quest_order()
+            if quest_handler.can_accept_quest(char, quest_id, all_quests, quest_graph)
+        ]
+        
+        if choice == "1":
+            display_quests(active, "Active Quests")
+        elif choice == "2":
+            display_quests(available, "Available Quests")
+        elif choice == "3":
+            display_quests(completed, "Completed Quests")
+        elif choice == "4":
+            quest_id = input("Enter the quest ID to accept: ").strip()
+            try:
+                quest_handler.accept_quest(char, quest_id, all_quests)
+                print(f"Quest accepted: {all_quests[quest_id].get('title', quest_id)}")
+            except QuestRequirementsNotMetError as e:
+                print(f"Cannot accept quest: {e}")
+                chain = quest_handler.get_quest_prerequisite_chain(quest_id, all_quests, quest_graph)
+                remaining = [step for step in chain[:-1] if step not in completed]
+                print(f"Complete these quests first: {' -> '.join(remaining)}")
+            except (QuestError, InsufficientLevelError) as e:
+                print(f"Cannot accept quest: {e}")
+        elif choice == "5":
+            quest_id = pick_quest(active, "Active Quests")
+            if quest_id is None:
+                continue
+            if quest_graph is not None:
+                blocked = sum(1 for other_id in all_quests if quest_graph.is_required_for(quest_id, other_id))
+                if blocked:
+                    print(f"Note: {blocked} other quest(s) need this one completed first.")
+            try:
+                quest_handler.abandon_quest(char, quest_id)
+                print("Quest abandoned.")
+            except QuestError as e:
+                print(f"Cannot abandon quest: {e}")
+        elif choice == "6":
+            quest_id = pick_quest(active, "Active Quests")
+            if quest_id is None:
+                continue
+            try:
+                rewards = quest_handler.complete_quest(char, quest_id, all_quests)
+                print(f"Quest complete! Gained {rewards['reward_xp']} XP and {rewards['reward_gold']} gold.")
+            except QuestError as e:
+                print(f"Cannot complete quest: {e}")
+        elif choice == "7":
+            return
+        else:
+            print("Invalid choice. Please select 1-7.")
 
 def explore():
     """Find and fight random enemies"""
@@ -678,7 +778,11 @@ def shop():
     if choice == '1': # Buy Items
         
         # --- Display Shop Items Logic (Merged from __display_shop_items__) ---
-        available_items = list(all_items.keys())
+        # Cheapest first, straight from the cost index built at load time
+        if item_lookup is not None:
+            available_items = item_lookup.in_cost_range(0, float("inf"))
+        else:
+            available_items = list(all_items.keys())
         print("\n--- Items for Sale ---")
         
         if not available_items:
@@ -820,7 +924,7 @@ def save_game():
 
 def load_game_data():
     """Load all quest and item data from files"""
-    global all_quests, all_items
+    global all_quests, all_items, item_lookup, quest_graph
     
     # TODO: Implement data loading
     # Try to load quests with game_data.load_quests()
@@ -828,110 +932,87 @@ def load_game_data():
     # Handle MissingDataFileError, InvalidDataFormatError
     # If files missing, create defaults with game_data.create_default_data_files()
     import os
-    import sys
 
     print("\n--- Loading Game Data ---")
-    defaults_created = False
 
-# --- QUeSTS LOADING ---
-    try:
-    # Logic to load quests (Part 1/3)
-        filepath = QUEST_FILE
-        data_type = "Quest"
-    
-        if not os.path.exists(filepath):
-            raise MissingDataFileError(f"{data_type} data file not found at {filepath}")
-    
-        with open(filepath, 'r') as f:
-            raw_data = f.read()
-        
-    # Simplified text parsing: Assume data is valid if read successfully
-        if not raw_data.strip():
-            raise InvalidDataFormatError(f"{data_type} data file is empty.")
-    
-    # Simulation of loading the dictionary (saving the raw string)
-        all_quests = {"data": raw_data} 
-        print(f"Quests data loaded successfully.")
-
-    except MissingDataFileError as e:
-        print(f"{e}")
-    
-    # Create defaults logic (In-line code)
-        os.makedirs(os.path.dirname(QUEST_FILE), exist_ok=True)
+    if not os.path.exists(QUEST_FILE) or not os.path.exists(ITEM_FILE):
         print("Creating default data files...")
-    
-    # Use simple text format
-        default_quests = "Q001_TUTORIAL|The First Quest|10\n"
-        with open(QUEST_FILE, 'w') as f:
-            f.write(default_quests)
-        
-        default_items = "P001_HP|Basic Potion|10|Consumable\n"
-        with open(ITEM_FILE, 'w') as f:
-            f.write(default_items)
-            print("Default data files created successfully.")
-            defaults_created = True
-
-    except InvalidDataFormatError as e:
-        print(f"Critical Error: {e}")
-        print("Game cannot start without valid quest data. Exiting.")
-        sys.exit(1)
+        game_data.create_default_data_files()
 
-    except Exception as e:
-        print(f"An unexpected error occurred while loading quests: {e}")
-        sys.exit(1)
+    # Quests and items are parsed side by side; every failure is collected
+    # so the player sees one report instead of fixing files one at a time.
+    records, errors = game_data.load_all(
+        [("quests", QUEST_FILE), ("items", ITEM_FILE)], workers=2
+    )
 
-# If defaults were just created, attempt to load quests again
-    if defaults_created and not all_quests:
+    # Prerequisite cycles are checked here, once, rather than on every
+    # quest lookup.
+    if QUEST_FILE in records:
         try:
-        # Logic to load quests (Part 2/3 - Duplicated logic)
-            filepath = QUEST_FILE
-            data_type = "Quest"
-        
-            if not os.path.exists(filepath):
-                raise MissingDataFileError(f"{data_type} data file not found at {filepath}")
-        
-            with open(filepath, 'r') as f:
-                raw_data = f.read()
-            
-            if not raw_data.strip():
-                raise InvalidDataFormatError(f"{data_type} data file is empty.")
-        
-            all_quests = {"data": raw_data} 
-            print(f"Quests data re-loaded successfully.")
-        
-        except Exception:
-            print("Failed to load quests even after creating defaults. Exiting.")
-            sys.exit(1)
+            quest_graph = game_data.QuestGraph(records[QUEST_FILE])
+        except InvalidDataFormatError as e:
+            errors[QUEST_FILE] = e
+
+    if errors:
+        report = "\n".join(f"  {path}: {error}" for path, error in errors.items())
+        print("-------------------------")
+        raise InvalidDataFormatError(f"Could not load game data:\n{report}")
+
+    all_quests = records[QUEST_FILE]
+    all_items = records[ITEM_FILE]
+    item_lookup = game_data.ItemIndex(all_items)
+    print(f"Loaded {len(all_quests)} quests and {len(all_items)} items.")
+    print("-------------------------")
 
-# --- ITEMS LOADING ---
-    try:
-    # Logic to load items (Part 3/3 - Duplicated logic)
-        filepath = ITEM_FILE
-        data_type = "Item"
+def start_data_watchers(interval=2.0):
+    """
+    Reload quests/items automatically when the data files are edited
     
-        if not os.path.exists(filepath):
-            raise MissingDataFileError(f"{data_type} data file not found at {filepath}")
+    The new catalog and everything derived from it (quest_graph for
+    quests, item_lookup for items) are built completely off to the side
+    and then assigned together in one statement, so code reading them
+    never sees a half loaded catalog and the shared index is never
+    changed in place. Safe to call before load_game_data.
     
-        with open(filepath, 'r') as f:
-            raw_data = f.read()
-        
-        if not raw_data.strip():
-            raise InvalidDataFormatError(f"{data_type} data file is empty.")
-    
-        all_items = {"data": raw_data} 
-        print(f"Items data loaded successfully.")
-
-    except MissingDataFileError as e:
-        print(f"{e}")
-    # Soft error if items file is missing and defaults were already handled
-
-    except InvalidDataFormatError as e:
-        print(f"Warning: {e}. Items data may be incomplete or unusable.")
-
-    except Exception as e:
-        print(f"An unexpected error occurred while loading items: {e}")
+    Returns: List of running game_data.CatalogWatcher objects
+    """
+    global data_watchers
 
-    print("-------------------------")
+    def swap_quests(records, diff):
+        global all_quests, quest_graph
+        try:
+            new_graph = game_data.QuestGraph(records)
+        except InvalidDataFormatError as e:
+            print(f"Quest reload ignored: {e}")
+            return
+        all_quests, quest_graph = records, new_graph
+        print(f"Quests reloaded: {len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['changed'])} changed.")
+
+    def swap_items(records, diff):
+        global all_items, item_lookup
+        if item_lookup is None:
+            new_lookup = game_data.ItemIndex(records)
+        else:
+            new_lookup = item_lookup.copy()
+            new_lookup.apply_diff(records, diff)
+        all_items, item_lookup = records, new_lookup
+        print(f"Items reloaded: {len(diff['added'])} added, {len(diff['removed'])} removed, {len(diff['changed'])} changed.")
+
+    stop_data_watchers()
+    data_watchers = [
+        game_data.CatalogWatcher(QUEST_FILE, "quests", on_change=swap_quests),
+        game_data.CatalogWatcher(ITEM_FILE, "items", on_change=swap_items)
+    ]
+    for watcher in data_watchers:
+        watcher.start(interval)
+    return data_watchers
+
+def stop_data_watchers():
+    """Stop any watchers started by start_data_watchers"""
+    global data_watchers
+    for watcher in data_watchers:
+        watcher.stop()
+    data_watchers = []
 
 def handle_character_death():
     """Handle character death"""
@@ -985,6 +1066,39 @@ def handle_character_death():
         else:
             print("Invalid choice. Please enter 1 or 2.")
 
+def startup_profile():
+    """
+    Time each subsystem import and the data load, then print a breakdown
+    
+    Run with: python main.py --startup-profile
+    
+    Returns: List of (step_name, seconds) tuples
+    """
+    timings = []
+    profile_start = time.perf_counter()
+
+    for module_name in SUBSYSTEM_MODULES:
+        start = time.perf_counter()
+        # Touching any attribute makes a lazy module finish importing
+        getattr(sys.modules[module_name], "__file__", None)
+        timings.append((f"import {module_name}", time.perf_counter() - start))
+
+    start = time.perf_counter()
+    try:
+        load_game_data()
+    except InvalidDataFormatError as e:
+        print(f"Error loading game data: {e}")
+    timings.append(("load_game_data", time.perf_counter() - start))
+
+    total = time.perf_counter() - profile_start
+
+    print("\n=== Startup Profile ===")
+    for step_name, seconds in timings:
+        print(f"{step_name:<28} {seconds * 1000:8.2f} ms")
+    print("-" * 40)
+    print(f"{'total to first menu':<28} {total * 1000:8.2f} ms")
+    return timings
+
 def display_welcome():
     """Display welcome message"""
     print("=" * 50)
@@ -1017,20 +1131,29 @@ def main():
         print("Please check data files for errors.")
         return
     
+    # Pick up edits to the data files while the game is running
+    start_data_watchers()
+    
     # Main menu loop
-    while True:
-        choice = main_menu()
-        
-        if choice == 1:
-            new_game()
-        elif choice == 2:
-            load_game()
-        elif choice == 3:
-            print("\nThanks for playing Quest Chronicles!")
-            break
-        else:
-            print("Invalid choice. Please select 1-3.")
+    try:
+        while True:
+            choice = main_menu()
+            
+            if choice == 1:
+                new_game()
+            elif choice == 2:
+                load_game()
+            elif choice == 3:
+                print("\nThanks for playing Quest Chronicles!")
+                break
+            else:
+                print("Invalid choice. Please select 1-3.")
+    finally:
+        stop_data_watchers()
 
 if __name__ == "__main__":
-    main()
+    if "--startup-profile" in sys.argv[1:]:
+        startup_profile()
+    else:
+        main()
 
@@ -55,7 +55,7 @@ def accept_quest(character, quest_id, quest_data_dict):
         raise QuestNotFoundError(f"Quest ID '{quest_id}' not found in quest data.")
     
     required_level = quest.get('required_level', 1)
-    prereq_quest = quest.get('prerequisite', "NONE")
+    prereq_quest = quest.get('prerequisite') or "NONE"
 
     character_level = character.get('level', 1)
     active_quests = character.get('active_quests', [])
@@ -122,22 +122,10 @@ def complete_quest(character, quest_id, quest_data_dict):
     character['completed_quests'] = completed_quests
 
     if reward_xp > 0:
-        character['experience'] = character.get('experience', 0) + reward_xp
+        import character_manager
 
-        while True:
-            current_level = character.get('level', 1)
-            required_xp = current_level * 100
-            
-            if character['experience'] >= required_xp:
-                character['level'] += 1
-                character['max_health'] += 10
-                character['strength'] += 2
-                character['magic'] += 2
-                character['health'] = character['max_health']
-                character['experience'] -= required_xp
-                print(f"{character['name']} leveled up to level {character['level']}!")
-            else:
-                break
+        if character_manager.apply_experience(character, reward_xp):
+            print(f"{character['name']} leveled up to level {character['level']}!")
     
     if reward_gold > 0:
         character['gold'] = character.get('gold', 0) + reward_gold
@@ -232,7 +220,7 @@ def get_available_quests(character, quest_data_dict):
         if character_level < required_level:
             continue
 
-        prereq_quest = quest_data.get('prerequisite', "NONE")
+        prereq_quest = quest_data.get('prerequisite') or "NONE"
 
         if prereq_quest != "NONE":
             if prereq_quest not in completed_quests:
@@ -264,10 +252,13 @@ def is_quest_active(character, quest_id):
     active_quests = character.get('active_quests', [])
     return quest_id in active_quests
 
-def can_accept_quest(character, quest_id, quest_data_dict):
+def can_accept_quest(character, quest_id, quest_data_dict, quest_graph=None):
     """
     Check if character meets all requirements to accept quest
     
+    If a game_data.QuestGraph built from quest_data_dict is passed, the
+    prerequisite is read from it instead of being looked up again.
+    
     Returns: True if can accept, False otherwise
     Does NOT raise exceptions - just returns boolean
     """
@@ -278,7 +269,10 @@ def can_accept_quest(character, quest_id, quest_data_dict):
         return False
     
     required_level = quest.get('required_level', 1)
-    prereq_quest = quest.get('prerequisite', "NONE")
+    if quest_graph is not None:
+        prereq_quest = quest_graph.prerequisite(quest_id) or "NONE"
+    else:
+        prereq_quest = quest.get('prerequisite') or "NONE"
 
     character_level = character.get('level', 1)
     active_quests = character.get('active_quests', [])
@@ -299,7 +293,7 @@ def can_accept_quest(character, quest_id, quest_data_dict):
     
     return True
 
-def get_quest_prerequisite_chain(quest_id, quest_data_dict):
+def get_quest_prerequisite_chain(quest_id, quest_data_dict, quest_graph=None):
     """
     Get the full chain of prerequisites for a quest
     
@@ -307,28 +301,38 @@ def get_quest_prerequisite_chain(quest_id, quest_data_dict):
     Example: If Quest C requires Quest B, which requires Quest A:
              Returns ["quest_a", "quest_b", "quest_c"]
     
+    If a game_data.QuestGraph built from quest_data_dict is passed, the
+    chain is read from it and cycles have already been ruled out. Either
+    way, a prerequisite missing from quest_data_dict is still listed
+    first in the chain.
+    
     Raises: QuestNotFoundError if quest doesn't exist
     """
     # TODO: Implement prerequisite chain tracing
     # Follow prerequisite links backwards
     # Build list in reverse order
+    if quest_graph is not None:
+        return quest_graph.prerequisite_chain(quest_id)
+
     chain = []
+    seen = set()
     current_id = quest_id
 
     if current_id not in quest_data_dict:
-        raise KeyError(f"QuestNotFoundError: Starting Quest ID '{quest_id}' not found in quest data.")
+        raise QuestNotFoundError(f"Starting Quest ID '{quest_id}' not found in quest data.")
     
     while current_id and current_id != "NONE":
         chain.append(current_id)
+        seen.add(current_id)
 
         quest = quest_data_dict.get(current_id)
 
         if not quest:
             break
 
-        prereq_id = quest.get('prerequisite', "NONE")
+        prereq_id = quest.get('prerequisite') or "NONE"
 
-        if prereq_id in chain:
+        if prereq_id in seen:
             print(f"Warning: Circular dependency detected in quest chain: {prereq_id} is a prerequisite for a quest in its own chain. Stopping chain tracing.")
             break 
 
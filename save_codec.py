@@ -0,0 +1,123 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Codec Module
+
+Binary encoding for character saves. The text format is one
+"KEY: value" line per field; the binary format packs the same fields
+with struct:
+
+    header    magic b"QCSB", version (1 byte), flags (1 byte)
+    body      FIXED: level/health/max_health/strength/magic/experience/
+              gold as seven little-endian 64-bit ints, then the byte
+              lengths of the five strings below
+              payload: name, class, inventory, active_quests and
+              completed_quests as UTF-8, back to back (lists are
+              comma-separated ids, as in the text format)
+
+Decoding is one struct unpack plus five slices, with no per-line or
+per-id parsing. If flags has FLAG_ZLIB set, the body is zlib-compressed.
+Loaders tell the formats apart with is_binary_save, so text saves stay
+readable.
+"""
+
+import struct
+import zlib
+
+from intern_table import intern_id
+from custom_exceptions import InvalidSaveDataError
+
+MAGIC = b"QCSB"
+VERSION = 1
+FLAG_ZLIB = 1
+
+HEADER = struct.Struct("<4sBB")
+FIXED = struct.Struct("<7qHHIII")
+
+STAT_FIELDS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+# ============================================================================
+# ENCODING
+# ============================================================================
+
+def encode_character(character, compress=False):
+    """
+    Encode a character dictionary in the binary save format
+
+    Args:
+        character: Character dictionary
+        compress: zlib-compress the body
+
+    Returns: bytes
+    Raises: InvalidSaveDataError if a field is missing or out of range
+    """
+    try:
+        strings = [str(character["name"]).encode("utf-8"), str(character["class"]).encode("utf-8")]
+        for field in LIST_FIELDS:
+            strings.append(",".join(map(str, character[field])).encode("utf-8"))
+        stats = [character[field] for field in STAT_FIELDS]
+        body = FIXED.pack(*stats, *(len(data) for data in strings)) + b"".join(strings)
+    except KeyError as e:
+        raise InvalidSaveDataError(f"Character is missing required field: {e}")
+    except struct.error as e:
+        raise InvalidSaveDataError(f"Character field can't be saved in binary format: {e}")
+
+    flags = 0
+    if compress:
+        body = zlib.compress(body)
+        flags |= FLAG_ZLIB
+    return HEADER.pack(MAGIC, VERSION, flags) + body
+
+# ============================================================================
+# DECODING
+# ============================================================================
+
+def is_binary_save(data):
+    """Return True if data starts with the binary save header"""
+    return data[:len(MAGIC)] == MAGIC
+
+def decode_character(data):
+    """
+    Decode bytes written by encode_character
+
+    Returns: Character dictionary
+    Raises: InvalidSaveDataError if the data is truncated, corrupt or
+            from an unknown version
+    """
+    if len(data) < HEADER.size or not is_binary_save(data):
+        raise InvalidSaveDataError("Not a binary save file")
+
+    _, version, flags = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise InvalidSaveDataError(f"Unsupported binary save version: {version}")
+
+    body = data[HEADER.size:]
+    if flags & FLAG_ZLIB:
+        try:
+            body = zlib.decompress(body)
+        except zlib.error as e:
+            raise InvalidSaveDataError(f"Compressed save data is corrupt: {e}")
+
+    try:
+        values = FIXED.unpack_from(body)
+    except struct.error:
+        raise InvalidSaveDataError("Binary save data is truncated")
+
+    lengths = values[len(STAT_FIELDS):]
+    if FIXED.size + sum(lengths) != len(body):
+        raise InvalidSaveDataError("Binary save data has the wrong length")
+
+    strings = []
+    offset = FIXED.size
+    try:
+        for length in lengths:
+            strings.append(body[offset:offset + length].decode("utf-8"))
+            offset += length
+    except UnicodeDecodeError as e:
+        raise InvalidSaveDataError(f"Binary save data is corrupt: {e}")
+
+    character = {"name": strings[0], "class": strings[1]}
+    character.update(zip(STAT_FIELDS, values))
+    for field, text in zip(LIST_FIELDS, strings[2:]):
+        character[field] = [intern_id(item) for item in text.split(",")] if text else []
+    return character
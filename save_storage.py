@@ -0,0 +1,874 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Storage Module
+
+Alternative save backends for character_manager. The default backend
+writes one {name}_save.txt per character; with hundreds of thousands of
+saves, listing them means scanning the whole directory. SQLiteSaveBackend
+keeps every character in one indexed table instead. JournalSaveBackend
+keeps the text files but turns most saves into small appends.
+ShardedSaveBackend spreads the text files over hash-prefix subdirectories
+and keeps a name index so listing never walks the directories.
+GroupCommitter batches saves made close together into one
+character_manager.save_characters call.
+
+Usage:
+    import character_manager
+    from save_storage import SQLiteSaveBackend
+
+    character_manager.set_save_backend(SQLiteSaveBackend())
+    character_manager.save_character(hero)   # now stored in SQLite
+"""
+
+import os
+import hashlib
+import time
+import sqlite3
+import threading
+
+from intern_table import intern_id
+import character_manager
+from character_manager import TextSaveBackend, PREVIOUS_SUFFIX
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError,
+    InvalidCharacterClassError
+)
+
+STAT_COLUMNS = (
+    "class", "level", "health", "max_health",
+    "strength", "magic", "experience", "gold"
+)
+LIST_COLUMNS = ("inventory", "active_quests", "completed_quests")
+ALL_COLUMNS = ("name",) + STAT_COLUMNS + LIST_COLUMNS
+INT_COLUMNS = STAT_COLUMNS[1:]
+
+# ============================================================================
+# SQLITE BACKEND
+# ============================================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    name TEXT PRIMARY KEY,
+    class TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    health INTEGER NOT NULL,
+    max_health INTEGER NOT NULL,
+    strength INTEGER NOT NULL,
+    magic INTEGER NOT NULL,
+    experience INTEGER NOT NULL,
+    gold INTEGER NOT NULL,
+    inventory TEXT NOT NULL,
+    active_quests TEXT NOT NULL,
+    completed_quests TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS characters_level ON characters (level);
+CREATE INDEX IF NOT EXISTS characters_class ON characters (class);
+"""
+
+class SQLiteSaveBackend:
+    """
+    Stores characters as rows of a characters table in one SQLite file
+
+    The database lives at {save_directory}/{database_name}, so the
+    save_directory argument of the character_manager functions still
+    chooses where saves go. name is the primary key (which SQLite
+    indexes), and level and class have their own indexes for find().
+    Connections use WAL mode so readers don't block the writer, and
+    save_many writes a whole batch in one transaction.
+
+    One connection is kept per database file and shared between threads
+    behind a lock. Call close() when done.
+    """
+
+    def __init__(self, database_name="characters.db"):
+        self.database_name = database_name
+        self._connections = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Connections and locks can't be pickled (e.g. to send the backend
+        # to load_all_characters worker processes); each copy reconnects
+        return {"database_name": self.database_name}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def database_path(self, save_directory):
+        """Return the SQLite file used for save_directory"""
+        return os.path.join(save_directory, self.database_name)
+
+    def _connect(self, save_directory, create=True):
+        """
+        Return the open connection for save_directory
+
+        Returns None instead of creating a database if create is False
+        and none exists yet (so loads and lists don't create files).
+        """
+        path = os.path.abspath(self.database_path(save_directory))
+        connection = self._connections.get(path)
+        if connection is not None:
+            return connection
+
+        if not create and not os.path.exists(path):
+            return None
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+        except sqlite3.DatabaseError as e:
+            raise SaveFileCorruptedError(f"Could not open save database {path}: {e}")
+
+        self._connections[path] = connection
+        return connection
+
+    def _row(self, character):
+        """Convert a character dictionary to a tuple in ALL_COLUMNS order"""
+        try:
+            return (
+                (character["name"],)
+                + tuple(character[column] for column in STAT_COLUMNS)
+                + tuple(",".join(map(str, character[column])) for column in LIST_COLUMNS)
+            )
+        except KeyError as e:
+            raise InvalidSaveDataError(f"Character is missing required field: {e}")
+
+    def save(self, character, save_directory):
+        return self.save_many([character], save_directory)
+
+    def save_many(self, characters, save_directory):
+        """
+        Insert or replace every character in one transaction
+
+        Returns: True if successful
+        """
+        rows = [self._row(character) for character in characters]
+        placeholders = ", ".join("?" for _ in ALL_COLUMNS)
+
+        with self._lock:
+            connection = self._connect(save_directory)
+            try:
+                with connection:
+                    connection.executemany(
+                        f"INSERT OR REPLACE INTO characters ({', '.join(ALL_COLUMNS)}) VALUES ({placeholders})",
+                        rows
+                    )
+            except sqlite3.DatabaseError as e:
+                raise SaveFileCorruptedError(f"Error writing to save database in {save_directory}: {e}")
+        return True
+
+    def load(self, character_name, save_directory):
+        with self._lock:
+            connection = self._connect(save_directory, create=False)
+            if connection is None:
+                raise CharacterNotFoundError(f"No save file found for character: {character_name}")
+            try:
+                row = connection.execute(
+                    f"SELECT {', '.join(ALL_COLUMNS)} FROM characters WHERE name = ?",
+                    (character_name,)
+                ).fetchone()
+            except sqlite3.DatabaseError as e:
+                raise SaveFileCorruptedError(f"Error reading save database in {save_directory}: {e}")
+
+        if row is None:
+            raise CharacterNotFoundError(f"No save file found for character: {character_name}")
+
+        character = dict(zip(ALL_COLUMNS[:len(STAT_COLUMNS) + 1], row))
+        for column, value in zip(LIST_COLUMNS, row[len(STAT_COLUMNS) + 1:]):
+            character[column] = [intern_id(item) for item in value.split(",")] if value else []
+        return character
+
+    def delete(self, character_name, save_directory):
+        with self._lock:
+            connection = self._connect(save_directory, create=False)
+            deleted = 0
+            if connection is not None:
+                with connection:
+                    deleted = connection.execute(
+                        "DELETE FROM characters WHERE name = ?", (character_name,)
+                    ).rowcount
+
+        if not deleted:
+            raise CharacterNotFoundError(f"Character save file not found for: {character_name}")
+        return True
+
+    def list_names(self, save_directory):
+        return self.find(save_directory)
+
+    def find(self, save_directory, character_class=None, min_level=None, max_level=None):
+        """
+        Get the names of saved characters matching every given filter
+
+        Uses the class and level indexes, so it doesn't read whole rows.
+
+        Returns: List of character names, sorted
+        """
+        conditions = []
+        parameters = []
+        if character_class is not None:
+            conditions.append("class = ?")
+            parameters.append(character_class)
+        if min_level is not None:
+            conditions.append("level >= ?")
+            parameters.append(min_level)
+        if max_level is not None:
+            conditions.append("level <= ?")
+            parameters.append(max_level)
+
+        query = "SELECT name FROM characters"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY name"
+
+        with self._lock:
+            connection = self._connect(save_directory, create=False)
+            if connection is None:
+                return []
+            return [name for (name,) in connection.execute(query, parameters)]
+
+    def close(self):
+        """Close every open database connection"""
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+
+# ============================================================================
+# JOURNALED TEXT BACKEND
+# ============================================================================
+
+JOURNAL_SUFFIX = "_save.journal"
+
+def encode_field(field, value):
+    """Return the text form of one character field (lists comma-separated)"""
+    if field in LIST_COLUMNS:
+        return ",".join(map(str, value))
+    return str(value)
+
+def decode_field(field, text):
+    """
+    Convert the text form of one character field back to its value
+
+    Raises: ValueError if an integer field isn't an integer
+    """
+    if field in LIST_COLUMNS:
+        return [intern_id(item) for item in text.split(",")] if text else []
+    if field in INT_COLUMNS:
+        return int(text)
+    return text
+
+def truncate_torn_tail(path):
+    """
+    Cut a partial last line off an append-only file
+
+    A crash mid-append leaves the file ending without a newline, and the
+    next append would continue that broken line. Everything after the
+    last newline is dropped so appends start on a fresh line again.
+
+    Returns: True if the file was truncated (False if it was complete or
+             doesn't exist)
+    """
+    try:
+        f = open(path, 'rb+')
+    except FileNotFoundError:
+        return False
+
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        keep = 0
+        position = end
+        while position > 0:
+            start = max(0, position - 4096)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b"\n")
+            if newline != -1:
+                keep = start + newline + 1
+                break
+            position = start
+
+        if keep == end:
+            return False
+        f.truncate(keep)
+    return True
+
+class JournalSaveBackend:
+    """
+    Saves characters as a text snapshot plus an append-only journal
+
+    The snapshot is the normal {name}_save.txt file. Each later save
+    compares the character to what was last written and appends one
+    line per changed field to {name}_save.journal:
+
+        SEQUENCE FIELD: value
+
+    so an autosave after picking up gold is a single short append instead
+    of rewriting the whole file. Once the journal holds more than
+    compact_threshold records the current state is written as a new
+    snapshot and the journal is removed.
+
+    load replays the journal over the snapshot. Every record holds the
+    field's new value (not a difference), and a save appends its changes
+    before compacting, so the journal always ends at the latest save.
+    Replaying it over the new snapshot (a crash before the journal was
+    removed) therefore gives the same result. A torn last line from a
+    crash mid-append is ignored and cut off the file before the next
+    append.
+    """
+
+    def __init__(self, compact_threshold=100):
+        self.compact_threshold = compact_threshold
+        self._snapshots = TextSaveBackend()
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"compact_threshold": self.compact_threshold}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def journal_path(self, character_name, save_directory):
+        """Return the journal file for character_name"""
+        return os.path.join(save_directory, f"{character_name}{JOURNAL_SUFFIX}")
+
+    def _read_journal(self, path):
+        """
+        Read every complete record from a journal file
+
+        Returns: List of (sequence, field, text) tuples (empty if no journal)
+        Raises: InvalidSaveDataError if a record is malformed or out of order
+        """
+        try:
+            with open(path, 'r') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return []
+        except IOError as e:
+            raise SaveFileCorruptedError(f"File reading error for {path}: {e}")
+
+        lines = content.split("\n")
+        # The last element is "" after a complete final record, or a torn
+        # partial record if the process died mid-append; skip it either way
+        # (_replay cuts it off the file before the next append)
+        records = []
+        last_sequence = 0
+        for line_number, line in enumerate(lines[:-1], start=1):
+            sequence_text, _, rest = line.partition(" ")
+            key, separator, text = rest.partition(": ")
+            field = key.lower()
+            if not separator or field not in ALL_COLUMNS or field == "name":
+                raise InvalidSaveDataError(f"Malformed journal record in {path} (line {line_number})")
+            try:
+                sequence = int(sequence_text)
+            except ValueError:
+                raise InvalidSaveDataError(f"Malformed journal sequence in {path} (line {line_number})")
+            if sequence <= last_sequence:
+                raise InvalidSaveDataError(f"Journal sequence out of order in {path} (line {line_number})")
+            last_sequence = sequence
+            records.append((sequence, field, text))
+        return records
+
+    def _replay(self, character_name, save_directory):
+        """
+        Load the snapshot and apply the journal on top
+
+        Returns: Tuple of (character, state) where state is the
+                 bookkeeping kept in self._state for the next save
+        """
+        character = self._snapshots.load(character_name, save_directory)
+        journal = self.journal_path(character_name, save_directory)
+        truncate_torn_tail(journal)
+        records = self._read_journal(journal)
+
+        try:
+            for _, field, text in records:
+                character[field] = decode_field(field, text)
+        except ValueError as e:
+            raise InvalidSaveDataError(f"Data format error in {character_name}'s save journal: {e}")
+
+        state = {
+            "fields": {field: encode_field(field, character[field]) for field in ALL_COLUMNS},
+            "sequence": records[-1][0] if records else 0,
+            "records": len(records)
+        }
+        return character, state
+
+    def _compact(self, character, save_directory, key):
+        """Write character as a fresh snapshot and drop its journal"""
+        self._snapshots.save(character, save_directory)
+        try:
+            os.remove(self.journal_path(character["name"], save_directory))
+        except FileNotFoundError:
+            pass
+        self._state[key] = {
+            "fields": {field: encode_field(field, character[field]) for field in ALL_COLUMNS},
+            "sequence": 0,
+            "records": 0
+        }
+
+    def save(self, character, save_directory):
+        name = character["name"]
+        key = os.path.abspath(self.journal_path(name, save_directory))
+
+        with self._lock:
+            state = self._state.get(key)
+            if state is None:
+                try:
+                    _, state = self._replay(name, save_directory)
+                except CharacterNotFoundError:
+                    self._compact(character, save_directory, key)
+                    return True
+
+            try:
+                changes = [
+                    (field, encode_field(field, character[field]))
+                    for field in ALL_COLUMNS[1:]
+                ]
+            except KeyError as e:
+                raise InvalidSaveDataError(f"Character is missing required field: {e}")
+            changes = [(field, text) for field, text in changes if state["fields"][field] != text]
+            if not changes:
+                return True
+
+            sequence = state["sequence"]
+            lines = []
+            for field, text in changes:
+                sequence += 1
+                lines.append(f"{sequence} {field.upper()}: {text}\n")
+            try:
+                with open(key, 'a') as f:
+                    f.write("".join(lines))
+            except OSError:
+                # Part of the append may have been written; replay (and
+                # drop any torn tail) on the next save
+                del self._state[key]
+                raise
+
+            state["sequence"] = sequence
+            state["records"] += len(changes)
+            state["fields"].update(changes)
+
+            # The changes are already in the journal, so a crash part way
+            # through compaction still replays to this save
+            if state["records"] > self.compact_threshold:
+                self._compact(character, save_directory, key)
+        return True
+
+    def save_many(self, characters, save_directory):
+        for character in characters:
+            self.save(character, save_directory)
+        return True
+
+    def load(self, character_name, save_directory):
+        with self._lock:
+            character, state = self._replay(character_name, save_directory)
+            self._state[os.path.abspath(self.journal_path(character_name, save_directory))] = state
+        return character
+
+    def delete(self, character_name, save_directory):
+        with self._lock:
+            path = self.journal_path(character_name, save_directory)
+            self._state.pop(os.path.abspath(path), None)
+            self._snapshots.delete(character_name, save_directory)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        return True
+
+    def list_names(self, save_directory):
+        return self._snapshots.list_names(save_directory)
+
+    def journal_records(self, character_name, save_directory):
+        """Return how many records are waiting in character_name's journal"""
+        return len(self._read_journal(self.journal_path(character_name, save_directory)))
+
+# ============================================================================
+# SHARDED TEXT BACKEND
+# ============================================================================
+
+INDEX_FILENAME = "characters.index"
+
+class ShardedSaveBackend:
+    """
+    Stores {name}_save.txt files in two levels of hash-prefix folders
+
+    A character's file goes in {save_directory}/ab/cd/ where abcd... is
+    the SHA-1 of its name, so no single directory gets huge. Names are
+    also recorded in {save_directory}/characters.index, one line per
+    change:
+
+        S<TAB>name<TAB>level<TAB>class     (saved)
+        D<TAB>name                         (deleted)
+
+    Saves and deletes append to the index (only when the name, level or
+    class changed), and list_names/page/summaries read it instead of
+    walking the folders. The index is rewritten without the old lines
+    once they outnumber the live names. Use migrate_flat_saves to move an
+    existing flat save directory over, and rebuild_index if the index is
+    ever lost.
+    """
+
+    def __init__(self):
+        self._files = TextSaveBackend()
+        self._indexes = {}
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def shard_directory(self, character_name, save_directory):
+        """Return the folder that holds character_name's save file"""
+        digest = hashlib.sha1(character_name.encode("utf-8")).hexdigest()
+        return os.path.join(save_directory, digest[:2], digest[2:4])
+
+    def index_path(self, save_directory):
+        return os.path.join(save_directory, INDEX_FILENAME)
+
+    # ------------------------------------------------------------------
+    # Name index
+    # ------------------------------------------------------------------
+
+    def _read_index(self, path):
+        """
+        Parse an index file
+
+        Returns: Tuple of (summaries, line_count) where summaries is
+                 {name: (level, class)}
+        """
+        summaries = {}
+        line_count = 0
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break   # torn final line (_index cuts it off before appending)
+                    line_count += 1
+                    parts = line[:-1].split("\t")
+                    if parts[0] == "S" and len(parts) == 4:
+                        summaries[parts[1]] = (int(parts[2]), parts[3])
+                    elif parts[0] == "D" and len(parts) == 2:
+                        summaries.pop(parts[1], None)
+                    else:
+                        raise InvalidSaveDataError(f"Malformed line in save index {path} (line {line_count})")
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            raise InvalidSaveDataError(f"Malformed level in save index {path} (line {line_count})")
+        return summaries, line_count
+
+    def _index(self, save_directory):
+        """Return the cached index state for save_directory, reloading if changed on disk"""
+        path = os.path.abspath(self.index_path(save_directory))
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+
+        state = self._indexes.get(path)
+        if state is None or state["size"] != size:
+            if truncate_torn_tail(path):
+                size = os.path.getsize(path)
+            summaries, line_count = self._read_index(path)
+            state = {"path": path, "summaries": summaries, "lines": line_count, "size": size}
+            self._indexes[path] = state
+        return state
+
+    def _append_index(self, state, lines):
+        """Append index lines, compacting the file if it has grown stale"""
+        os.makedirs(os.path.dirname(state["path"]), exist_ok=True)
+        try:
+            with open(state["path"], 'a') as f:
+                f.write("".join(lines))
+        except OSError:
+            # Reread (and drop any torn tail) before the next append
+            self._indexes.pop(state["path"], None)
+            raise
+        state["lines"] += len(lines)
+
+        if state["lines"] > 2 * len(state["summaries"]) + 64:
+            self._write_index(state)
+        else:
+            state["size"] = os.path.getsize(state["path"])
+
+    def _write_index(self, state):
+        """Rewrite the index with one S line per live name"""
+        temp_path = f"{state['path']}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            for name, (level, character_class) in sorted(state["summaries"].items()):
+                f.write(f"S\t{name}\t{level}\t{character_class}\n")
+        os.replace(temp_path, state["path"])
+        state["lines"] = len(state["summaries"])
+        state["size"] = os.path.getsize(state["path"])
+
+    def _record_save(self, character, save_directory):
+        with self._lock:
+            state = self._index(save_directory)
+            summary = (character["level"], character["class"])
+            if state["summaries"].get(character["name"]) != summary:
+                state["summaries"][character["name"]] = summary
+                self._append_index(state, [f"S\t{character['name']}\t{summary[0]}\t{summary[1]}\n"])
+
+    # ------------------------------------------------------------------
+    # Backend interface
+    # ------------------------------------------------------------------
+
+    def save(self, character, save_directory):
+        if "\t" in character["name"] or "\n" in character["name"]:
+            raise InvalidSaveDataError(f"Character name cannot contain tabs or newlines: {character['name']!r}")
+        self._files.save(character, self.shard_directory(character["name"], save_directory))
+        self._record_save(character, save_directory)
+        return True
+
+    def save_many(self, characters, save_directory):
+        for character in characters:
+            self.save(character, save_directory)
+        return True
+
+    def load(self, character_name, save_directory):
+        return self._files.load(character_name, self.shard_directory(character_name, save_directory))
+
+    def delete(self, character_name, save_directory):
+        self._files.delete(character_name, self.shard_directory(character_name, save_directory))
+        with self._lock:
+            state = self._index(save_directory)
+            if state["summaries"].pop(character_name, None) is not None:
+                self._append_index(state, [f"D\t{character_name}\n"])
+        return True
+
+    def list_names(self, save_directory):
+        with self._lock:
+            return sorted(self._index(save_directory)["summaries"])
+
+    def summaries(self, save_directory):
+        """
+        Get the level and class of every saved character from the index
+
+        Returns: Dictionary {name: {'level': int, 'class': str}}
+        """
+        with self._lock:
+            return {
+                name: {"level": level, "class": character_class}
+                for name, (level, character_class) in self._index(save_directory)["summaries"].items()
+            }
+
+    def page(self, save_directory, page_number=0, page_size=50):
+        """
+        Get one page of saved characters, sorted by name
+
+        Returns: List of {'name', 'level', 'class'} dictionaries
+        """
+        start = page_number * page_size
+        with self._lock:
+            summaries = self._index(save_directory)["summaries"]
+            names = sorted(summaries)[start:start + page_size]
+            return [
+                {"name": name, "level": summaries[name][0], "class": summaries[name][1]}
+                for name in names
+            ]
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def migrate_flat_saves(self, save_directory):
+        """
+        Move {name}_save.txt files from the top of save_directory into shards
+
+        Each file is read (to get its level and class for the index) and
+        then moved with os.replace. Files that fail to load are left where
+        they are.
+
+        Returns: Tuple of (migrated_names, failed_names)
+        """
+        migrated = []
+        failed = []
+        for name in self._files.list_names(save_directory):
+            try:
+                character = self._files.load(name, save_directory)
+            except (SaveFileCorruptedError, InvalidSaveDataError, InvalidCharacterClassError):
+                # TextSaveBackend.load reports a missing key as InvalidCharacterClassError
+                failed.append(name)
+                continue
+
+            shard = self.shard_directory(name, save_directory)
+            os.makedirs(shard, exist_ok=True)
+            for filename in (f"{name}_save.txt", f"{name}_save.txt{PREVIOUS_SUFFIX}"):
+                if os.path.exists(os.path.join(save_directory, filename)):
+                    os.replace(os.path.join(save_directory, filename), os.path.join(shard, filename))
+            self._record_save(character, save_directory)
+            migrated.append(name)
+        return migrated, failed
+
+    def rebuild_index(self, save_directory):
+        """
+        Recreate the index by walking every shard folder
+
+        Returns: Number of characters indexed
+        """
+        summaries = {}
+        for root, _, filenames in os.walk(save_directory):
+            if os.path.abspath(root) == os.path.abspath(save_directory):
+                continue
+            for filename in filenames:
+                if filename.endswith("_save.txt"):
+                    name = filename[:-len("_save.txt")]
+                    try:
+                        character = self._files.load(name, root)
+                    except (SaveFileCorruptedError, InvalidSaveDataError, InvalidCharacterClassError):
+                        continue
+                    summaries[name] = (character["level"], character["class"])
+
+        with self._lock:
+            state = self._index(save_directory)
+            state["summaries"] = summaries
+            self._write_index(state)
+        return len(summaries)
+
+# ============================================================================
+# GROUP COMMIT
+# ============================================================================
+
+class GroupCommitter:
+    """
+    Background writer that batches saves requested close together
+
+    submit() queues a copy of a character and returns right away. A
+    worker thread waits up to window seconds after the first queued save
+    so others can join, then writes the whole batch with
+    character_manager.save_characters (one directory fsync for text
+    saves). If the same character is submitted twice before its batch is
+    written, only the latest copy is saved.
+
+    submit() rejects a character that couldn't be saved (missing or
+    invalid fields) right away, so one bad character never sinks the
+    rest of its batch. flush() blocks until everything submitted so far
+    is written and close() (or leaving a with block) flushes and stops
+    the thread. A batch that still fails (e.g. a disk error) is recorded
+    in last_error, its characters are counted in stats()['failed'] and
+    the flush waiting on it returns False.
+    """
+
+    def __init__(self, save_directory="data/save_games", window=0.05):
+        self.save_directory = save_directory
+        self.window = window
+        self.last_error = None
+
+        self._pending = {}
+        self._writing = False
+        self._flushing = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._counts = {"submitted": 0, "coalesced": 0, "saves": 0, "batches": 0, "failed": 0}
+        self._busy_seconds = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="GroupCommitter", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, character):
+        """
+        Queue character to be saved in the next batch
+
+        Raises: InvalidSaveDataError if character is missing a saved field
+                or fails character_manager.validate_character_data,
+                RuntimeError if the committer has been closed
+        """
+        snapshot = {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in character.items()
+        }
+        missing = [field for field in ALL_COLUMNS if field not in snapshot]
+        if missing:
+            raise InvalidSaveDataError(f"Character is missing required fields: {', '.join(missing)}")
+        character_manager.validate_character_data(snapshot)
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("GroupCommitter is closed")
+            if snapshot["name"] in self._pending:
+                self._counts["coalesced"] += 1
+            self._pending[snapshot["name"]] = snapshot
+            self._counts["submitted"] += 1
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Write any queued saves now and wait until they are on disk
+
+        Returns: True if everything was written before timeout; False on
+                 timeout or if a batch failed while waiting (see last_error)
+        """
+        with self._condition:
+            failed = self._counts["failed"]
+            self._flushing = True
+            self._condition.notify_all()
+            done = self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+            self._flushing = False
+            return done and self._counts["failed"] == failed
+
+    def close(self):
+        """Flush outstanding saves and stop the worker thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def stats(self):
+        """
+        Return throughput counters
+
+        saves_per_sec is characters written per second spent writing
+        batches (None before the first batch).
+        """
+        with self._condition:
+            result = dict(self._counts)
+            result["pending"] = len(self._pending)
+            result["seconds"] = round(self._busy_seconds, 6)
+            result["saves_per_sec"] = (
+                round(self._counts["saves"] / self._busy_seconds, 1) if self._busy_seconds > 0 else None
+            )
+            return result
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                # Give other saves a chance to join this batch
+                self._condition.wait_for(lambda: self._flushing or self._closed, self.window)
+                batch = list(self._pending.values())
+                self._pending.clear()
+                self._writing = True
+
+            start = time.perf_counter()
+            error = None
+            try:
+                character_manager.save_characters(batch, self.save_directory)
+            except Exception as e:
+                error = e
+            elapsed = time.perf_counter() - start
+
+            with self._condition:
+                if error is None:
+                    self._counts["saves"] += len(batch)
+                    self._counts["batches"] += 1
+                    self._busy_seconds += elapsed
+                else:
+                    self.last_error = error
+                    self._counts["failed"] += len(batch)
+                self._writing = False
+                self._condition.notify_all()
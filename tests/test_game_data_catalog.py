@@ -0,0 +1,721 @@
+"""
+Test Game Data Catalog
+Tests for catalog loading features layered on top of game_data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import QuestNotFoundError
+
+SAMPLE_ITEMS = """ITEM_ID: health_potion
+NAME: Health Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Restores 20 health points
+
+ITEM_ID: iron_sword
+NAME: Iron Sword
+TYPE: weapon
+EFFECT: strength:5
+COST: 100
+DESCRIPTION: A sturdy iron sword
+"""
+
+def write_items(tmp_path, content=SAMPLE_ITEMS):
+    """Write an items file into tmp_path and return its path"""
+    path = tmp_path / "items.txt"
+    path.write_text(content)
+    return str(path)
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_compiled_cache_written_and_reused(tmp_path):
+    """Test that a second load is served from the compiled cache"""
+    path = write_items(tmp_path)
+
+    items = game_data.load_items(path)
+    assert os.path.exists(game_data.get_cache_path(path))
+
+    cached = game_data.load_compiled_cache(path, "items")
+    assert cached == items
+    assert game_data.load_items(path) == items
+
+def test_compiled_cache_invalidated_on_change(tmp_path):
+    """Test that editing the text file rebuilds the cache"""
+    path = write_items(tmp_path)
+    game_data.load_items(path)
+
+    write_items(tmp_path, SAMPLE_ITEMS.replace("COST: 25", "COST: 30"))
+
+    assert game_data.load_compiled_cache(path, "items") is None
+    assert game_data.load_items(path)['health_potion']['cost'] == 30
+
+def test_compiled_cache_corrupt_file_rebuilds(tmp_path):
+    """Test that a damaged cache file is treated as a miss, never an error"""
+    import random
+
+    path = write_items(tmp_path)
+    expected = game_data.load_items(path)
+    cache_path = game_data.get_cache_path(path)
+    with open(cache_path, 'rb') as f:
+        original = f.read()
+
+    rng = random.Random(163)
+    for _ in range(300):
+        damaged = bytearray(original)
+        for _ in range(3):
+            damaged[rng.randrange(len(damaged))] = rng.randrange(256)
+        with open(cache_path, 'wb') as f:
+            f.write(bytes(damaged))
+        assert game_data.load_items(path) == expected
+
+    with open(cache_path, 'wb') as f:
+        f.write(b"not a pickle")
+    assert game_data.load_compiled_cache(path, "items") is None
+
+def test_compiled_cache_kind_mismatch(tmp_path):
+    """Test that an items cache is never returned for quests"""
+    path = write_items(tmp_path)
+    game_data.load_items(path)
+
+    assert game_data.load_compiled_cache(path, "quests") is None
+
+# ============================================================================
+# STREAMING READER TESTS
+# ============================================================================
+
+def test_iter_records_yields_raw_blocks(tmp_path):
+    """Test that iter_records yields one lowercase-keyed block at a time"""
+    path = write_items(tmp_path)
+
+    records = game_data.iter_records(path)
+    first = next(records)
+    records.close()
+
+    assert first['item_id'] == 'health_potion'
+    assert first['effect'] == 'health:20'
+
+def test_iter_records_reports_line_number(tmp_path):
+    """Test that malformed lines raise InvalidDataFormatError with location"""
+    from custom_exceptions import InvalidDataFormatError
+    path = write_items(tmp_path, SAMPLE_ITEMS + "\nITEM_ID: broken\nno colon here\n")
+
+    with pytest.raises(InvalidDataFormatError, match="line 16"):
+        list(game_data.iter_records(path))
+
+def test_parse_blocks_share_field_parser():
+    """Test that parse_item_block accepts the same lines as load_items"""
+    lines = SAMPLE_ITEMS.split("\n\n")[0].splitlines()
+    item = game_data.parse_item_block(lines)
+
+    assert item['cost'] == 25
+    assert item['effect'] == {'stat': 'health', 'value': 20}
+
+# ============================================================================
+# LAZY ITEM CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_matches_load_items(tmp_path):
+    """Test that LazyItemCatalog parses items on demand"""
+    path = write_items(tmp_path)
+
+    with game_data.LazyItemCatalog(path) as catalog:
+        assert len(catalog) == 2
+        assert 'iron_sword' in catalog
+        assert catalog.loaded_count() == 0
+
+        assert catalog['iron_sword'] == game_data.load_items(path, use_cache=False)['iron_sword']
+        assert catalog.loaded_count() == 1
+        assert catalog.get('missing_item') is None
+
+def test_lazy_catalog_works_with_inventory(tmp_path):
+    """Test that LazyItemCatalog can be passed as item_data"""
+    import inventory_system
+    path = write_items(tmp_path)
+    char = {'name': 'Lazy', 'inventory': [], 'gold': 100}
+
+    with game_data.LazyItemCatalog(path) as catalog:
+        inventory_system.purchase_item(char, 'health_potion', catalog)
+
+    assert char['gold'] == 75
+    assert char['inventory'] == ['health_potion']
+
+def test_lazy_catalog_rebuilds_corrupt_index(tmp_path):
+    """Test that a damaged .index file is rebuilt instead of raising"""
+    import random
+
+    path = write_items(tmp_path)
+    expected = game_data.load_item_offset_index(path)
+    index_path = path + game_data.INDEX_SUFFIX
+    with open(index_path, 'rb') as f:
+        original = f.read()
+
+    rng = random.Random(163)
+    for _ in range(300):
+        damaged = bytearray(original)
+        for _ in range(3):
+            damaged[rng.randrange(len(damaged))] = rng.randrange(256)
+        with open(index_path, 'wb') as f:
+            f.write(bytes(damaged))
+        assert game_data.load_item_offset_index(path) == expected
+
+    with game_data.LazyItemCatalog(path) as catalog:
+        assert catalog['health_potion']['cost'] == 25
+
+# ============================================================================
+# PARALLEL LOADING TESTS
+# ============================================================================
+
+def test_load_all_collects_records_and_errors(tmp_path):
+    """Test that load_all loads every pack and reports failures per file"""
+    items_path = write_items(tmp_path)
+    missing_path = str(tmp_path / "missing_quests.txt")
+
+    records, errors = game_data.load_all(
+        [("items", items_path), ("quests", missing_path)], workers=2
+    )
+
+    assert set(records[items_path]) == {'health_potion', 'iron_sword'}
+    assert missing_path in errors
+
+def test_load_all_rejects_unknown_kind(tmp_path):
+    """Test that load_all validates catalog kinds up front"""
+    with pytest.raises(ValueError):
+        game_data.load_all([("enemies", str(tmp_path / "enemies.txt"))])
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_catalog_watcher_reports_diff(tmp_path):
+    """Test that CatalogWatcher swaps in a new catalog and reports the diff"""
+    path = write_items(tmp_path)
+    changes = []
+    watcher = game_data.CatalogWatcher(path, "items", on_change=lambda records, diff: changes.append((records, diff)))
+    old_sword = watcher.records['iron_sword']
+
+    assert watcher.poll() is None
+
+    edited = SAMPLE_ITEMS.replace("COST: 25", "COST: 30") + """
+ITEM_ID: magic_robe
+NAME: Magic Robe
+TYPE: armor
+EFFECT: magic:5
+COST: 150
+DESCRIPTION: Enchanted robes
+"""
+    write_items(tmp_path, edited)
+    os.utime(path, ns=(0, 1))
+
+    diff = watcher.poll()
+    assert diff == {'added': ['magic_robe'], 'removed': [], 'changed': ['health_potion']}
+    assert changes[0][0]['health_potion']['cost'] == 30
+    # Unchanged blocks are not re-parsed
+    assert watcher.records['iron_sword'] is old_sword
+
+def test_catalog_watcher_keeps_old_catalog_on_error(tmp_path):
+    """Test that a broken edit leaves the previous catalog in place"""
+    path = write_items(tmp_path)
+    watcher = game_data.CatalogWatcher(path, "items")
+
+    write_items(tmp_path, SAMPLE_ITEMS + "\nbroken line\n")
+    os.utime(path, ns=(0, 1))
+
+    assert watcher.poll() is None
+    assert watcher.last_error is not None
+    assert set(watcher.records) == {'health_potion', 'iron_sword'}
+
+def test_catalog_watcher_records_callback_errors(tmp_path):
+    """Test that an on_change exception is kept in last_error, not raised"""
+    path = write_items(tmp_path)
+
+    def broken_callback(records, diff):
+        raise KeyError("boom")
+
+    watcher = game_data.CatalogWatcher(path, "items", on_change=broken_callback)
+    write_items(tmp_path, SAMPLE_ITEMS.replace("COST: 25", "COST: 30"))
+    os.utime(path, ns=(0, 1))
+
+    assert watcher.poll() is None
+    assert isinstance(watcher.last_error, KeyError)
+
+def test_catalog_watcher_retries_failed_callback(tmp_path):
+    """Test that a change whose on_change failed is delivered again on the next poll"""
+    path = write_items(tmp_path)
+    calls = []
+
+    def flaky_callback(records, diff):
+        calls.append(diff)
+        if len(calls) == 1:
+            raise KeyError("boom")
+
+    watcher = game_data.CatalogWatcher(path, "items", on_change=flaky_callback)
+    write_items(tmp_path, SAMPLE_ITEMS.replace("COST: 25", "COST: 30"))
+    os.utime(path, ns=(0, 1))
+
+    assert watcher.poll() is None
+    assert watcher.records['health_potion']['cost'] == 25
+    diff = watcher.poll()
+    assert diff == {'added': [], 'removed': [], 'changed': ['health_potion']}
+    assert calls == [diff, diff]
+    assert watcher.records['health_potion']['cost'] == 30
+    assert watcher.last_error is None
+    assert watcher.poll() is None
+    assert len(calls) == 2
+
+def test_main_watchers_swap_catalog_and_index(tmp_path, monkeypatch):
+    """Test that main's item watcher replaces all_items and item_lookup together"""
+    import main
+
+    items_path = write_items(tmp_path)
+    quests_path = tmp_path / "quests.txt"
+    quests_path.write_text("")
+    monkeypatch.setattr(main, "ITEM_FILE", items_path)
+    monkeypatch.setattr(main, "QUEST_FILE", str(quests_path))
+    monkeypatch.setattr(main, "item_lookup", None)
+    monkeypatch.setattr(main, "all_items", {})
+
+    watchers = main.start_data_watchers(interval=60)
+    try:
+        # Watchers started before load_game_data must still work
+        write_items(tmp_path, SAMPLE_ITEMS.replace("COST: 25", "COST: 30"))
+        os.utime(items_path, ns=(0, 1))
+        assert watchers[1].poll() is not None
+        assert watchers[1].last_error is None
+        first_index = main.item_lookup
+        assert main.item_lookup.in_cost_range(30, 30) == ['health_potion']
+
+        write_items(tmp_path, SAMPLE_ITEMS.replace("COST: 25", "COST: 35"))
+        os.utime(items_path, ns=(0, 2))
+        assert watchers[1].poll() is not None
+        # The old index is left untouched for anyone still reading it
+        assert first_index.in_cost_range(30, 30) == ['health_potion']
+        assert main.item_lookup.in_cost_range(35, 35) == ['health_potion']
+        assert main.all_items['health_potion']['cost'] == 35
+    finally:
+        main.stop_data_watchers()
+
+# ============================================================================
+# ITEM TABLE TESTS
+# ============================================================================
+
+def test_item_table_queries():
+    """Test vectorized ItemTable filters against the shipped items"""
+    pytest.importorskip("numpy")
+    import item_table
+
+    items = game_data.load_items("data/items.txt", use_cache=False)
+    table = item_table.ItemTable(items)
+
+    assert len(table) == len(items)
+    assert set(table.affordable(50)) == {i for i, item in items.items() if item['cost'] <= 50}
+    assert set(table.by_type('weapon')) == {'iron_sword', 'steel_sword', 'fire_staff'}
+    assert table.top_k_by_effect('strength', 2) == ['steel_sword', 'iron_sword']
+
+# ============================================================================
+# SECONDARY INDEX TESTS
+# ============================================================================
+
+def test_item_index_lookups():
+    """Test type, effect stat and cost range lookups"""
+    items = game_data.load_items("data/items.txt", use_cache=False)
+    index = game_data.ItemIndex(items)
+
+    assert set(index.by_type('armor')) == {'leather_armor', 'steel_armor', 'magic_robe'}
+    assert set(index.by_effect_stat('magic')) == {'fire_staff', 'magic_robe', 'wisdom_elixir'}
+    assert index.in_cost_range(50, 75) == ['strength_elixir', 'wisdom_elixir', 'super_health_potion', 'leather_armor']
+
+def test_item_index_bulk_build_matches_incremental():
+    """Test that the one-sort build orders ties like adding items one by one"""
+    items = {
+        f"item_{number}": {"type": "weapon", "effect": "strength:1", "cost": (number * 37) % 11}
+        for number in range(200)
+    }
+    bulk = game_data.ItemIndex(items)
+    incremental = game_data.ItemIndex()
+    incremental.apply_diff(items, {"added": list(items), "removed": [], "changed": []})
+
+    assert bulk.in_cost_range(0, 100) == incremental.in_cost_range(0, 100)
+    assert bulk.in_cost_range(3, 4) == incremental.in_cost_range(3, 4)
+
+def test_item_index_apply_diff(tmp_path):
+    """Test that ItemIndex follows a CatalogWatcher reload"""
+    path = write_items(tmp_path)
+    watcher = game_data.CatalogWatcher(path, "items")
+    index = game_data.ItemIndex(watcher.records)
+
+    write_items(tmp_path, SAMPLE_ITEMS.replace("COST: 100", "COST: 10").replace("TYPE: weapon", "TYPE: armor"))
+    os.utime(path, ns=(0, 1))
+    diff = watcher.poll()
+    index.apply_diff(watcher.records, diff)
+
+    assert index.by_type('weapon') == []
+    assert index.by_type('armor') == ['iron_sword']
+    assert index.in_cost_range(0, 20) == ['iron_sword']
+    assert len(index) == 2
+
+# ============================================================================
+# QUEST GRAPH TESTS
+# ============================================================================
+
+def test_quest_graph_chain_and_ancestry():
+    """Test QuestGraph chains, depth and transitive prerequisite checks"""
+    quests = game_data.load_quests("data/quests.txt", use_cache=False)
+    graph = game_data.QuestGraph(quests)
+
+    assert graph.prerequisite_chain('dragon_slayer') == ['first_steps', 'goblin_hunter', 'orc_menace', 'dragon_slayer']
+    assert graph.depth['master_adventurer'] == 4
+    assert graph.is_required_for('first_steps', 'treasure_hunter')
+    assert not graph.is_required_for('goblin_hunter', 'treasure_hunter')
+
+    order = graph.topological_order
+    for quest_id, prereq_id in graph.parent.items():
+        assert order.index(prereq_id) < order.index(quest_id)
+
+def test_quest_graph_rejects_cycles():
+    """Test that circular prerequisites are caught when the graph is built"""
+    from custom_exceptions import InvalidDataFormatError
+    quests = {
+        'a': {'prerequisite': 'c'},
+        'b': {'prerequisite': 'a'},
+        'c': {'prerequisite': 'b'},
+        'd': {'prerequisite': None}
+    }
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.QuestGraph(quests)
+
+def test_quest_graph_reports_cycle_behind_long_chain():
+    """Test that a cycle at the end of a long chain is reported on its own"""
+    from custom_exceptions import InvalidDataFormatError
+    quests = {f'q{n}': {'prerequisite': f'q{n + 1}'} for n in range(20000)}
+    quests['q20000'] = {'prerequisite': 'q20001'}
+    quests['q20001'] = {'prerequisite': 'q20000'}
+
+    with pytest.raises(InvalidDataFormatError, match="q20000 -> q20001 -> q20000$"):
+        game_data.QuestGraph(quests)
+
+def test_prerequisite_chain_uses_graph():
+    """Test quest_handler.get_quest_prerequisite_chain with and without a graph"""
+    import quest_handler
+    quests = {
+        'first_quest': {'prerequisite': 'NONE'},
+        'second_quest': {'prerequisite': 'first_quest'}
+    }
+    graph = game_data.QuestGraph(quests)
+
+    expected = ['first_quest', 'second_quest']
+    assert quest_handler.get_quest_prerequisite_chain('second_quest', quests) == expected
+    assert quest_handler.get_quest_prerequisite_chain('second_quest', quests, graph) == expected
+
+def test_prerequisite_chain_missing_prerequisite_agrees():
+    """Test that both chain paths list a prerequisite missing from the catalog"""
+    import quest_handler
+    quests = {
+        'second_quest': {'prerequisite': 'removed_quest'},
+        'third_quest': {'prerequisite': 'second_quest'}
+    }
+    graph = game_data.QuestGraph(quests)
+
+    expected = ['removed_quest', 'second_quest', 'third_quest']
+    assert quest_handler.get_quest_prerequisite_chain('third_quest', quests) == expected
+    assert quest_handler.get_quest_prerequisite_chain('third_quest', quests, graph) == expected
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain('nowhere', quests)
+    with pytest.raises(QuestNotFoundError):
+        quest_handler.get_quest_prerequisite_chain('nowhere', quests, graph)
+
+def test_can_accept_quest_with_graph():
+    """Test that can_accept_quest gives the same answers with a QuestGraph"""
+    import quest_handler
+    quests = game_data.load_quests("data/quests.txt", use_cache=False)
+    graph = game_data.QuestGraph(quests)
+    character = {'level': 3, 'active_quests': [], 'completed_quests': ['first_steps']}
+
+    for quest_id in quests:
+        assert quest_handler.can_accept_quest(character, quest_id, quests, graph) == \
+            quest_handler.can_accept_quest(character, quest_id, quests)
+    assert quest_handler.can_accept_quest(character, 'goblin_hunter', quests, graph)
+    assert not quest_handler.can_accept_quest(character, 'orc_menace', quests, graph)
+
+# ============================================================================
+# RECORD TYPE TESTS
+# ============================================================================
+
+def test_item_record_is_mapping_compatible(tmp_path):
+    """Test that ItemRecord behaves like the old item dictionary"""
+    path = write_items(tmp_path)
+    item = game_data.load_items(path, use_cache=False)['iron_sword']
+
+    assert isinstance(item, game_data.ItemRecord)
+    assert not hasattr(item, '__dict__')
+    assert item['cost'] == 100
+    assert item.get('missing', 'default') == 'default'
+    assert item['effect'] == {'stat': 'strength', 'value': 5}
+    assert dict(item)['type'] == 'weapon'
+    assert game_data.validate_item_data(item) == True
+
+def test_record_ids_are_interned(tmp_path):
+    """Test that ids from separate loads share one string object"""
+    path = write_items(tmp_path)
+    first = game_data.load_items(path, use_cache=False)['iron_sword']
+    second = game_data.load_items(path, use_cache=False)['iron_sword']
+
+    assert first['id'] is second['id']
+    assert first['effect']['stat'] is second['effect']['stat']
+
+# ============================================================================
+# BENCHMARK TESTS
+# ============================================================================
+
+def test_generated_catalogs_load(tmp_path):
+    """Test that the benchmark generators write loadable catalogs"""
+    import benchmarks
+    quests_path = str(tmp_path / "quests.txt")
+    items_path = str(tmp_path / "items.txt")
+
+    benchmarks.write_quests_file(quests_path, 50, chain_length=20)
+    benchmarks.write_items_file(items_path, 50)
+
+    quests = game_data.load_quests(quests_path, use_cache=False)
+    assert len(quests) == 50
+    assert len(game_data.load_items(items_path, use_cache=False)) == 50
+    assert game_data.QuestGraph(quests).depth['quest_19'] == 19
+
+def test_run_benchmarks_reports_json(tmp_path):
+    """Test that run_benchmarks returns JSON-serializable timings"""
+    import json
+    import benchmarks
+
+    results = benchmarks.run_benchmarks([10], chain_length=5, track_memory=False, directory=str(tmp_path))
+    timings = json.loads(json.dumps(results))["sizes"]["10"]
+
+    assert timings["load_items"]["records_per_sec"] > 0
+    assert "parse_quest_block" in timings
+
+# ============================================================================
+# BULK VALIDATION TESTS
+# ============================================================================
+
+def test_validate_catalog_file_reports_every_error(tmp_path):
+    """Test that bulk validation keeps going and reports line numbers"""
+    import json
+    bad_items = SAMPLE_ITEMS.replace("COST: 25", "COST: lots") + """
+ITEM_ID: iron_sword
+NAME: Second Sword
+TYPE: weapon
+no colon here
+EFFECT: strength:7
+COST: 80
+DESCRIPTION: Duplicate id
+
+ITEM_ID: mystery
+NAME: Mystery
+TYPE: trinket
+EFFECT: luck:1
+COST: 5
+DESCRIPTION: Bad type
+"""
+    path = write_items(tmp_path, bad_items)
+    report_path = str(tmp_path / "report.json")
+
+    report = game_data.validate_catalog_file(path, "items", report_path)
+
+    assert report['records'] == 4
+    assert not report['valid']
+    lines = [(error['line'], error['id']) for error in report['errors']]
+    assert lines == [(1, 'health_potion'), (18, None), (15, 'iron_sword'), (23, 'mystery')]
+    with open(report_path) as f:
+        assert json.load(f) == report
+
+def test_validate_catalog_file_valid_data():
+    """Test that the shipped data files validate cleanly"""
+    assert game_data.validate_catalog_file("data/quests.txt", "quests")['valid']
+    assert game_data.validate_catalog_file("data/items.txt", "items")['valid']
+
+# ============================================================================
+# COMPILED EFFECT TESTS
+# ============================================================================
+
+def test_item_effect_is_immutable(tmp_path):
+    """Test that compiled effects cannot be changed after loading"""
+    path = write_items(tmp_path)
+    effect = game_data.load_items(path)['iron_sword']['effect']
+
+    with pytest.raises(TypeError):
+        effect['value'] = 50
+    with pytest.raises(AttributeError):
+        effect.value = 50
+    assert game_data.load_items(path)['iron_sword']['effect'] == effect
+
+def test_inventory_uses_compiled_effects(tmp_path):
+    """Test that use_item applies compiled and legacy string effects alike"""
+    import inventory_system
+    items = game_data.load_items(write_items(tmp_path), use_cache=False)
+    char = {'name': 'Effect', 'inventory': ['health_potion', 'health_potion'], 'health': 10, 'max_health': 100}
+
+    inventory_system.use_item(char, 'health_potion', items)
+    assert char['health'] == 30
+
+    legacy = {'health_potion': {'type': 'consumable', 'effect': 'health:20'}}
+    inventory_system.use_item(char, 'health_potion', legacy)
+    assert char['health'] == 50
+
+    assert inventory_system.get_item_effect(items['iron_sword']['effect']) == ('strength', 5)
+    assert inventory_system.get_item_effect('strength:5') == ('strength', 5)
+
+# ============================================================================
+# SHARED MEMORY CATALOG TESTS
+# ============================================================================
+
+def _shared_item_cost(name, item_id):
+    """Worker helper: attach to a published catalog and read one item"""
+    catalog = game_data.SharedCatalog(name)
+    try:
+        return catalog[item_id]['cost']
+    finally:
+        catalog.close()
+
+def test_shared_catalog_round_trip(tmp_path):
+    """Test publishing a catalog and attaching to it by name"""
+    items = game_data.load_items(write_items(tmp_path), use_cache=False)
+
+    with game_data.SharedCatalog.publish(items) as published:
+        attached = game_data.SharedCatalog(published.name)
+        try:
+            assert len(attached) == 2
+            assert attached['iron_sword'] == items['iron_sword']
+            assert attached.get('missing') is None
+        finally:
+            attached.close()
+
+def test_shared_catalog_released_without_close(tmp_path, monkeypatch):
+    """Test that dropping an attached catalog without close() doesn't raise BufferError"""
+    import gc
+    items = game_data.load_items(write_items(tmp_path), use_cache=False)
+    errors = []
+    monkeypatch.setattr(sys, 'unraisablehook', errors.append)
+
+    with game_data.SharedCatalog.publish(items) as published:
+        attached = game_data.SharedCatalog(published.name)
+        assert attached['iron_sword']['cost'] == items['iron_sword']['cost']
+        del attached
+        gc.collect()
+
+    assert errors == []
+
+def test_shared_catalog_survives_attacher_exit(tmp_path):
+    """Test that a separate process attaching and exiting doesn't destroy the block"""
+    import subprocess
+    items = game_data.load_items(write_items(tmp_path), use_cache=False)
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = (
+        "import sys, game_data\n"
+        "catalog = game_data.SharedCatalog(sys.argv[1])\n"
+        "print(catalog['health_potion']['cost'])\n"
+        "catalog.close()\n"
+    )
+
+    with game_data.SharedCatalog.publish(items) as published:
+        result = subprocess.run(
+            [sys.executable, "-c", script, published.name],
+            cwd=repo_root, capture_output=True, text=True, timeout=60
+        )
+        assert result.stdout.split()[-1] == "25"
+
+        attached = game_data.SharedCatalog(published.name)
+        try:
+            assert attached['iron_sword'] == items['iron_sword']
+        finally:
+            attached.close()
+
+def test_shared_catalog_from_worker_process(tmp_path):
+    """Test that a worker process can read the parent's shared catalog"""
+    import multiprocessing
+    items = game_data.load_items(write_items(tmp_path), use_cache=False)
+
+    with game_data.SharedCatalog.publish(items) as published:
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            cost = pool.apply(_shared_item_cost, (published.name, 'health_potion'))
+
+    assert cost == 25
+
+# ============================================================================
+# CATALOG PACK TESTS
+# ============================================================================
+
+EXTRA_ITEMS = """ITEM_ID: iron_sword
+NAME: Rebalanced Iron Sword
+TYPE: weapon
+EFFECT: strength:6
+COST: 120
+DESCRIPTION: Patched sword
+
+ITEM_ID: fire_staff
+NAME: Fire Staff
+TYPE: weapon
+EFFECT: magic:8
+COST: 200
+DESCRIPTION: A magical staff
+"""
+
+def write_manifest(tmp_path, policy):
+    """Write a two pack manifest with the given policy on the second pack"""
+    write_items(tmp_path)
+    (tmp_path / "extra_items.txt").write_text(EXTRA_ITEMS)
+    manifest = tmp_path / "packs.txt"
+    manifest.write_text(
+        "PACK_ID: base\nKIND: items\nFILE: items.txt\n\n"
+        f"PACK_ID: extra\nKIND: items\nFILE: extra_items.txt\nON_DUPLICATE: {policy}\n"
+    )
+    return str(manifest)
+
+def test_load_packs_override_and_keep(tmp_path):
+    """Test that duplicate ids follow each pack's merge policy"""
+    overridden = game_data.load_packs(write_manifest(tmp_path, "override"))['items']
+    kept = game_data.load_packs(write_manifest(tmp_path, "keep"))['items']
+
+    assert set(overridden) == {'health_potion', 'iron_sword', 'fire_staff'}
+    assert overridden['iron_sword']['cost'] == 120
+    assert kept['iron_sword']['cost'] == 100
+
+def test_load_packs_duplicate_error(tmp_path):
+    """Test that the default policy rejects duplicate ids"""
+    from custom_exceptions import InvalidDataFormatError
+
+    with pytest.raises(InvalidDataFormatError, match="iron_sword"):
+        game_data.load_packs(write_manifest(tmp_path, "error"))
+
+# ============================================================================
+# ID INTERNING TESTS
+# ============================================================================
+
+def test_ids_are_interned_across_subsystems(tmp_path):
+    """Test that catalogs, saves and inventories share one copy of each id"""
+    import character_manager
+    import inventory_system
+    from intern_table import intern_id
+
+    items = game_data.load_items(write_items(tmp_path), use_cache=False)
+    item_id = next(iter(items))
+
+    character = character_manager.create_character("Ada", "Warrior")
+    character["inventory"] = ["".join(["health", "_potion"])]
+    save_dir = str(tmp_path / "saves")
+    character_manager.save_character(character, save_dir)
+    loaded = character_manager.load_character("Ada", save_dir)
+
+    assert loaded["inventory"][0] is item_id
+    assert loaded["inventory"][0] is intern_id("".join(["health", "_potion"]))
+
+    inventory_system.add_item_to_inventory(loaded, "".join(["iron", "_sword"]))
+    assert loaded["inventory"][1] is items["iron_sword"]["id"]
+    assert items["iron_sword"]["effect"]["stat"] is inventory_system.parse_item_effect("strength:9")[0]
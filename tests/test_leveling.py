@@ -0,0 +1,70 @@
+"""
+Test Leveling
+Tests for the closed-form leveling engine in character_manager
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import quest_handler
+
+def level_by_loop(level, experience):
+    """The original one-level-at-a-time loop, used as the reference"""
+    levels = 0
+    while experience >= (level + levels) * 100:
+        experience -= (level + levels) * 100
+        levels += 1
+    return levels, experience
+
+# ============================================================================
+# LEVEL-UP MATH TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("level", [1, 2, 7, 50])
+def test_compute_level_ups_matches_loop(level):
+    """Test that compute_level_ups agrees with the one-level-at-a-time loop"""
+    for experience in list(range(0, 3000, 37)) + [99, 100, 299, 300, 123456]:
+        assert character_manager.compute_level_ups(level, experience) == level_by_loop(level, experience)
+
+def test_compute_level_ups_exact_boundaries():
+    """Test experience that lands exactly on (or just short of) a level"""
+    # 100 + 200 + 300 = 600 XP takes level 1 to level 4 with nothing left
+    assert character_manager.compute_level_ups(1, 600) == (3, 0)
+    assert character_manager.compute_level_ups(1, 599) == (2, 299)
+
+def test_compute_level_ups_huge_grant():
+    """Test that a grant worth a million levels is computed directly"""
+    # 10**6 levels from level 1 costs 100 * (10**6 * (10**6 + 1) / 2)
+    experience = 100 * (10**6 * (10**6 + 1) // 2)
+    assert character_manager.compute_level_ups(1, experience) == (10**6, 0)
+
+# ============================================================================
+# EXPERIENCE GRANT TESTS
+# ============================================================================
+
+def test_gain_experience_applies_stat_gains_once():
+    """Test that gaining several levels at once applies every stat gain"""
+    character = character_manager.create_character("Ada", "Warrior")
+    character['health'] = 5
+    character_manager.gain_experience(character, 650)
+
+    assert character['level'] == 4
+    assert character['experience'] == 50
+    assert character['max_health'] == 130
+    assert character['strength'] == 21
+    assert character['magic'] == 11
+    assert character['health'] == 130
+
+def test_complete_quest_uses_engine():
+    """Test that quest rewards level up through the same engine"""
+    character = character_manager.create_character("Ada", "Warrior")
+    character['active_quests'] = ["q1"]
+    quests = {"q1": {"reward_xp": 700, "reward_gold": 0}}
+    quest_handler.complete_quest(character, "q1", quests)
+
+    assert (character['level'], character['experience']) == (4, 100)
+    assert character['strength'] == 21
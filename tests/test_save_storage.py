@@ -0,0 +1,528 @@
+"""
+Test Save Storage
+Tests for the pluggable save backends in character_manager and save_storage
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_codec
+from custom_exceptions import CharacterNotFoundError, InvalidSaveDataError, SaveFileCorruptedError
+from save_storage import GroupCommitter, JournalSaveBackend, ShardedSaveBackend, SQLiteSaveBackend
+
+def make_character(name, character_class="Warrior", level=1):
+    """Create a character with a few items and one completed quest"""
+    character = character_manager.create_character(name, character_class)
+    character["level"] = level
+    character["inventory"] = ["health_potion", "iron_sword"]
+    character["completed_quests"] = ["first_steps"]
+    return character
+
+@pytest.fixture
+def sqlite_backend():
+    """Install a SQLiteSaveBackend for the duration of a test"""
+    backend = SQLiteSaveBackend()
+    previous = character_manager.set_save_backend(backend)
+    yield backend
+    character_manager.set_save_backend(previous)
+    backend.close()
+
+# ============================================================================
+# SAVE BACKEND TESTS
+# ============================================================================
+
+def test_text_backend_is_default(tmp_path):
+    """Test that saves go to text files unless another backend is set"""
+    assert isinstance(character_manager.get_save_backend(), character_manager.TextSaveBackend)
+    character_manager.save_character(make_character("Ada"), str(tmp_path))
+    assert os.path.exists(tmp_path / "Ada_save.txt")
+
+def test_sqlite_round_trip(tmp_path, sqlite_backend):
+    """Test saving, loading, listing and deleting through SQLiteSaveBackend"""
+    save_dir = str(tmp_path)
+    hero = make_character("Ada", level=3)
+    assert character_manager.save_character(hero, save_dir) is True
+
+    assert character_manager.load_character("Ada", save_dir) == hero
+    assert not os.path.exists(tmp_path / "Ada_save.txt")
+
+    hero["gold"] = 5
+    character_manager.save_character(hero, save_dir)
+    assert character_manager.load_character("Ada", save_dir)["gold"] == 5
+    assert character_manager.list_saved_characters(save_dir) == ["Ada"]
+
+    assert character_manager.delete_character("Ada", save_dir) is True
+    assert character_manager.list_saved_characters(save_dir) == []
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Ada", save_dir)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("Ada", save_dir)
+
+def test_sqlite_missing_directory(tmp_path, sqlite_backend):
+    """Test that reading a missing save directory doesn't create it"""
+    save_dir = str(tmp_path / "nowhere")
+    assert character_manager.list_saved_characters(save_dir) == []
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Ada", save_dir)
+    assert not os.path.exists(save_dir)
+
+def test_sqlite_batch_and_find(tmp_path, sqlite_backend):
+    """Test save_many and find() on a batch of SQLite saves"""
+    save_dir = str(tmp_path)
+    characters = [
+        make_character(f"hero_{number}", ("Warrior", "Mage")[number % 2], level=number)
+        for number in range(1, 101)
+    ]
+    sqlite_backend.save_many(characters, save_dir)
+
+    assert len(character_manager.list_saved_characters(save_dir)) == 100
+    assert sqlite_backend.find(save_dir, character_class="Mage", min_level=95) == [
+        "hero_95", "hero_97", "hero_99"
+    ]
+
+    journal_mode = sqlite_backend._connect(save_dir).execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+
+# ============================================================================
+# JOURNAL BACKEND TESTS
+# ============================================================================
+
+def test_journal_appends_changed_fields(tmp_path):
+    """Test that the journal backend appends only changed fields"""
+    save_dir = str(tmp_path)
+    backend = JournalSaveBackend(compact_threshold=5)
+    hero = make_character("Ada")
+    backend.save(hero, save_dir)
+    snapshot = (tmp_path / "Ada_save.txt").read_text()
+
+    hero["gold"] = 150
+    backend.save(hero, save_dir)
+    backend.save(hero, save_dir)
+    hero["inventory"].append("leather_armor")
+    backend.save(hero, save_dir)
+
+    assert (tmp_path / "Ada_save.txt").read_text() == snapshot
+    assert (tmp_path / "Ada_save.journal").read_text() == (
+        "1 GOLD: 150\n2 INVENTORY: health_potion,iron_sword,leather_armor\n"
+    )
+    # A fresh backend has no cached state and must replay from disk
+    assert JournalSaveBackend().load("Ada", save_dir) == hero
+
+def test_journal_compacts_past_threshold(tmp_path):
+    """Test that the journal is folded into the snapshot past the threshold"""
+    save_dir = str(tmp_path)
+    backend = JournalSaveBackend(compact_threshold=3)
+    hero = make_character("Ada")
+    backend.save(hero, save_dir)
+
+    for gold in range(101, 104):
+        hero["gold"] = gold
+        backend.save(hero, save_dir)
+    assert backend.journal_records("Ada", save_dir) == 3
+
+    hero["gold"] = 200
+    backend.save(hero, save_dir)
+    assert not os.path.exists(tmp_path / "Ada_save.journal")
+    assert character_manager.load_character("Ada", save_dir)["gold"] == 200
+
+def test_journal_compaction_survives_crash(tmp_path, monkeypatch):
+    """Test a crash after the new snapshot is written but before the journal is removed"""
+    save_dir = str(tmp_path)
+    backend = JournalSaveBackend(compact_threshold=2)
+    hero = make_character("Ada")
+    backend.save(hero, save_dir)
+    hero["gold"] = 150
+    backend.save(hero, save_dir)
+    hero["level"] = 3
+    backend.save(hero, save_dir)
+
+    def crash(path):
+        raise OSError("simulated crash")
+
+    hero["gold"] = 175
+    hero["inventory"].append("leather_armor")
+    monkeypatch.setattr(os, "remove", crash)
+    with pytest.raises(OSError):
+        backend.save(hero, save_dir)
+    monkeypatch.undo()
+
+    assert os.path.exists(tmp_path / "Ada_save.journal")
+    assert JournalSaveBackend().load("Ada", save_dir) == hero
+
+def test_journal_ignores_torn_final_record(tmp_path):
+    """Test that a torn last journal line is ignored but bad sequences are not"""
+    save_dir = str(tmp_path)
+    backend = JournalSaveBackend()
+    hero = make_character("Ada")
+    backend.save(hero, save_dir)
+    hero["level"] = 4
+    backend.save(hero, save_dir)
+
+    with open(tmp_path / "Ada_save.journal", "a") as f:
+        f.write("2 GOLD: 99")
+
+    assert JournalSaveBackend().load("Ada", save_dir) == hero
+    with open(tmp_path / "Ada_save.journal", "a") as f:
+        f.write("\n1 GOLD: 5\n")
+    with pytest.raises(InvalidSaveDataError):
+        JournalSaveBackend().load("Ada", save_dir)
+
+def test_journal_save_after_torn_record(tmp_path):
+    """Test that saving after a torn record starts a fresh journal line"""
+    save_dir = str(tmp_path)
+    hero = make_character("Ada")
+    JournalSaveBackend().save(hero, save_dir)
+    hero["gold"] = 150
+    JournalSaveBackend().save(hero, save_dir)
+    with open(tmp_path / "Ada_save.journal", "a") as f:
+        f.write("2 GOLD: 1")   # crash mid-append
+
+    backend = JournalSaveBackend()
+    assert backend.load("Ada", save_dir) == hero
+    hero["gold"] = 300
+    backend.save(hero, save_dir)
+
+    assert (tmp_path / "Ada_save.journal").read_text() == "1 GOLD: 150\n2 GOLD: 300\n"
+    assert JournalSaveBackend().load("Ada", save_dir) == hero
+
+# ============================================================================
+# CHARACTER CACHE TESTS
+# ============================================================================
+
+def test_character_cache_hits_and_write_back(tmp_path):
+    """Test LRU hits, eviction and write-back of dirty characters"""
+    save_dir = str(tmp_path)
+    for name in ("Ada", "Bo", "Cy"):
+        character_manager.save_character(make_character(name), save_dir)
+
+    cache = character_manager.CharacterCache(capacity=2, save_directory=save_dir)
+    ada = cache.get("Ada")
+    assert cache.get("Ada") is ada
+    ada["gold"] = 999
+    cache.mark_dirty("Ada")
+
+    cache.get("Bo")
+    cache.get("Ada")
+    cache.get("Cy")   # evicts Bo, which is clean
+    assert "Bo" not in cache
+    assert character_manager.load_character("Ada", save_dir)["gold"] == 100
+
+    cache.get("Bo")   # evicts Ada, which is dirty and gets saved
+    assert character_manager.load_character("Ada", save_dir)["gold"] == 999
+    assert cache.stats() == {
+        "hits": 2, "misses": 4, "evictions": 2, "size": 2, "dirty": 0, "capacity": 2
+    }
+
+def test_character_cache_flush(tmp_path):
+    """Test flushing dirty characters and the cache's error cases"""
+    save_dir = str(tmp_path)
+    with character_manager.CharacterCache(save_directory=save_dir) as cache:
+        cache.put(make_character("Ada"))
+        assert cache.is_dirty("Ada")
+        assert not os.path.exists(tmp_path / "Ada_save.txt")
+        assert cache.flush() == 1
+        assert cache.flush() == 0
+
+        cache.get("Ada")["level"] = 9
+        cache.mark_dirty("Ada")
+        with pytest.raises(CharacterNotFoundError):
+            cache.mark_dirty("Nobody")
+        with pytest.raises(ValueError):
+            character_manager.CharacterCache(capacity=0)
+
+    assert character_manager.load_character("Ada", save_dir)["level"] == 9
+
+# ============================================================================
+# SHARDED BACKEND TESTS
+# ============================================================================
+
+def test_sharded_layout_and_index(tmp_path):
+    """Test the sharded directory layout and its summary index"""
+    save_dir = str(tmp_path)
+    backend = ShardedSaveBackend()
+    for number in range(30):
+        backend.save(make_character(f"hero_{number:02}", level=number + 1), save_dir)
+
+    shard = backend.shard_directory("hero_05", save_dir)
+    assert os.path.exists(os.path.join(shard, "hero_05_save.txt"))
+    assert len(os.path.relpath(shard, save_dir).split(os.sep)) == 2
+    assert backend.load("hero_05", save_dir)["level"] == 6
+
+    backend.delete("hero_00", save_dir)
+    assert backend.page(save_dir, page_number=1, page_size=10)[0] == {
+        "name": "hero_11", "level": 12, "class": "Warrior"
+    }
+    # A fresh backend reads the same index from disk
+    fresh = ShardedSaveBackend()
+    assert fresh.list_names(save_dir) == [f"hero_{number:02}" for number in range(1, 30)]
+    assert fresh.summaries(save_dir)["hero_29"] == {"level": 30, "class": "Warrior"}
+
+    os.remove(backend.index_path(save_dir))
+    assert fresh.rebuild_index(save_dir) == 29
+    assert len(ShardedSaveBackend().list_names(save_dir)) == 29
+
+def test_sharded_index_compacts(tmp_path):
+    """Test that repeated saves don't grow the sharded index forever"""
+    save_dir = str(tmp_path)
+    backend = ShardedSaveBackend()
+    hero = make_character("Ada")
+    for level in range(1, 201):
+        hero["level"] = level
+        backend.save(hero, save_dir)
+
+    with open(backend.index_path(save_dir)) as f:
+        assert len(f.readlines()) < 70
+    assert ShardedSaveBackend().summaries(save_dir) == {"Ada": {"level": 200, "class": "Warrior"}}
+
+def test_sharded_index_save_after_torn_line(tmp_path):
+    """Test that saving after a torn index line doesn't corrupt the index"""
+    save_dir = str(tmp_path)
+    ShardedSaveBackend().save(make_character("Ada"), save_dir)
+    with open(tmp_path / "characters.index", "a") as f:
+        f.write("S\tBo\t1")   # crash mid-append
+
+    backend = ShardedSaveBackend()
+    backend.save(make_character("Cy"), save_dir)
+    assert backend.list_names(save_dir) == ["Ada", "Cy"]
+    assert ShardedSaveBackend().list_names(save_dir) == ["Ada", "Cy"]
+    assert (tmp_path / "characters.index").read_text().endswith("\tCy\t1\tWarrior\n")
+
+def test_migrate_flat_saves(tmp_path):
+    """Test moving flat save files into the sharded layout"""
+    save_dir = str(tmp_path)
+    for name in ("Ada", "Bo"):
+        character_manager.save_character(make_character(name), save_dir)
+    (tmp_path / "Broken_save.txt").write_text("NAME: Broken\nLEVEL: x\n")
+
+    backend = ShardedSaveBackend()
+    migrated, failed = backend.migrate_flat_saves(save_dir)
+    assert (sorted(migrated), failed) == (["Ada", "Bo"], ["Broken"])
+    assert not os.path.exists(tmp_path / "Ada_save.txt")
+    assert os.path.exists(tmp_path / "Broken_save.txt")
+
+    previous = character_manager.set_save_backend(backend)
+    try:
+        assert character_manager.load_character("Bo", save_dir)["name"] == "Bo"
+        assert character_manager.list_saved_characters(save_dir) == ["Ada", "Bo"]
+    finally:
+        character_manager.set_save_backend(previous)
+
+# ============================================================================
+# BINARY FORMAT TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_binary_saves_round_trip_and_autodetect(tmp_path, compress):
+    """Test binary saves and loading them through the text backend"""
+    save_dir = str(tmp_path)
+    hero = make_character("Ada", level=12)
+    binary = character_manager.TextSaveBackend(save_format="binary", compress=compress)
+    binary.save(hero, save_dir)
+
+    data = (tmp_path / "Ada_save.txt").read_bytes()
+    assert save_codec.is_binary_save(data)
+    # The default text backend autodetects the binary file
+    assert character_manager.load_character("Ada", save_dir) == hero
+
+    character_manager.save_character(hero, save_dir)
+    assert (tmp_path / "Ada_save.txt").read_text().startswith("NAME: Ada\n")
+    assert binary.load("Ada", save_dir) == hero
+
+def test_binary_codec_rejects_bad_data():
+    """Test that the binary codec rejects truncated or unknown data"""
+    data = save_codec.encode_character(make_character("Ada"))
+    assert save_codec.decode_character(data)["inventory"] == ["health_potion", "iron_sword"]
+
+    with pytest.raises(InvalidSaveDataError):
+        save_codec.decode_character(data[:-3])
+    with pytest.raises(InvalidSaveDataError):
+        save_codec.decode_character(data[:4] + b"\x09" + data[5:])
+    with pytest.raises(InvalidSaveDataError):
+        save_codec.encode_character({"name": "Ada"})
+    with pytest.raises(ValueError):
+        character_manager.TextSaveBackend(save_format="xml")
+
+def test_save_format_benchmark_runs(tmp_path):
+    """Test that the save format benchmark runs on a small roster"""
+    import benchmarks
+
+    results = benchmarks.run_save_formats(20, str(tmp_path), track_memory=False)
+    assert set(results) == {"text", "binary", "binary_zlib"}
+    assert results["binary_zlib"]["bytes_per_character"] < results["text"]["bytes_per_character"]
+
+# ============================================================================
+# BATCH SAVE TESTS
+# ============================================================================
+
+def test_save_characters_batch(tmp_path):
+    """Test saving a batch of characters in one call"""
+    save_dir = str(tmp_path)
+    characters = [make_character(f"hero_{number}") for number in range(10)]
+    assert character_manager.save_characters(characters, save_dir) is True
+
+    assert sorted(character_manager.list_saved_characters(save_dir)) == sorted(
+        character["name"] for character in characters
+    )
+    assert character_manager.load_character("hero_3", save_dir) == characters[3]
+    assert not [name for name in os.listdir(save_dir) if name.endswith(".tmp")]
+
+def test_group_committer_coalesces_saves(tmp_path):
+    """Test that repeated submits of one character are coalesced"""
+    save_dir = str(tmp_path)
+    hero = make_character("Ada")
+    with GroupCommitter(save_dir, window=10) as committer:
+        for gold in range(5):
+            hero["gold"] = gold
+            committer.submit(hero)
+        committer.submit(make_character("Bo"))
+        hero["gold"] = 1000   # changes after submit are not saved
+        assert committer.flush(timeout=5)
+
+        stats = committer.stats()
+        assert (stats["saves"], stats["batches"], stats["coalesced"]) == (2, 1, 4)
+        assert stats["saves_per_sec"] > 0
+
+    assert character_manager.load_character("Ada", save_dir)["gold"] == 4
+    with pytest.raises(RuntimeError):
+        committer.submit(hero)
+
+def test_group_committer_rejects_bad_character(tmp_path):
+    """Test that a bad submission is rejected without losing the rest of the batch"""
+    save_dir = str(tmp_path)
+    broken = make_character("Broken")
+    del broken["class"]
+    with GroupCommitter(save_dir, window=10) as committer:
+        committer.submit(make_character("Ada"))
+        with pytest.raises(InvalidSaveDataError):
+            committer.submit(broken)
+        committer.submit(make_character("Bo"))
+        assert committer.flush(timeout=5)
+        assert committer.last_error is None
+
+    assert sorted(character_manager.list_saved_characters(save_dir)) == ["Ada", "Bo"]
+
+def test_save_characters_skips_bad_character(tmp_path):
+    """Test that save_characters writes the good characters and names the bad one"""
+    save_dir = str(tmp_path)
+    broken = make_character("Broken")
+    del broken["completed_quests"]
+    with pytest.raises(InvalidSaveDataError, match="Broken"):
+        character_manager.save_characters([make_character("Ada"), broken, make_character("Bo")], save_dir)
+
+    assert sorted(character_manager.list_saved_characters(save_dir)) == ["Ada", "Bo"]
+    assert not [name for name in os.listdir(save_dir) if name.endswith(".tmp")]
+
+def test_group_committer_records_errors(tmp_path):
+    """Test that a failed group commit is recorded instead of raised"""
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    committer = GroupCommitter(str(blocker), window=0)
+    committer.submit(make_character("Ada"))
+    assert committer.flush(timeout=5) is False
+    committer.close()
+    assert committer.last_error is not None
+    assert committer.stats()["failed"] == 1
+
+# ============================================================================
+# CRASH SAFETY TESTS
+# ============================================================================
+
+def test_saves_are_atomic_with_checksum(tmp_path):
+    """Test that saves end in a checksum and keep the previous generation"""
+    save_dir = str(tmp_path)
+    hero = make_character("Ada")
+    character_manager.save_character(hero, save_dir)
+    content = (tmp_path / "Ada_save.txt").read_bytes()
+    assert content.splitlines()[-1].startswith(b"CHECKSUM: ")
+    assert character_manager.split_checksum(content)[1] == "ok"
+
+    hero["gold"] = 500
+    character_manager.save_character(hero, save_dir)
+    assert (tmp_path / "Ada_save.txt.prev").read_bytes() == content
+    assert character_manager.list_saved_characters(save_dir) == ["Ada"]
+    assert not [name for name in os.listdir(save_dir) if name.endswith(".tmp")]
+
+def test_torn_save_falls_back_to_previous_generation(tmp_path):
+    """Test loading the previous generation after a torn write"""
+    save_dir = str(tmp_path)
+    hero = make_character("Ada")
+    character_manager.save_character(hero, save_dir)
+    hero["gold"] = 500
+    character_manager.save_character(hero, save_dir)
+
+    path = tmp_path / "Ada_save.txt"
+    path.write_bytes(path.read_bytes()[:40])   # simulate a crash mid-write
+    assert character_manager.load_character("Ada", save_dir)["gold"] == 100
+
+    path.unlink()   # crash between the two renames
+    assert character_manager.list_saved_characters(save_dir) == ["Ada"]
+    assert character_manager.load_character("Ada", save_dir)["gold"] == 100
+
+    assert character_manager.delete_character("Ada", save_dir) is True
+    assert os.listdir(save_dir) == []
+
+def test_damaged_save_without_previous_generation(tmp_path):
+    """Test checksum failures and saves written before checksums"""
+    save_dir = str(tmp_path)
+    character_manager.save_character(make_character("Ada"), save_dir)
+    path = tmp_path / "Ada_save.txt"
+    path.write_bytes(path.read_bytes().replace(b"GOLD: 100", b"GOLD: 999"))
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Ada", save_dir)
+
+    # Files written before checksums were added still load
+    path.write_bytes(path.read_bytes().rsplit(b"CHECKSUM", 1)[0])
+    assert character_manager.load_character("Ada", save_dir)["gold"] == 999
+
+@pytest.mark.parametrize("policy", ["never", "batch", "always"])
+def test_fsync_policies(tmp_path, policy):
+    """Test every fsync policy and rejecting an unknown one"""
+    backend = character_manager.TextSaveBackend(fsync_policy=policy)
+    backend.save(make_character("Ada"), str(tmp_path))
+    backend.save_many([make_character("Bo"), make_character("Cy")], str(tmp_path))
+    assert backend.load("Cy", str(tmp_path))["name"] == "Cy"
+    with pytest.raises(ValueError):
+        character_manager.TextSaveBackend(fsync_policy="sometimes")
+
+# ============================================================================
+# PARALLEL LOAD TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_load_all_characters_reports_errors(tmp_path, mode):
+    """Test that load_all_characters yields errors instead of stopping"""
+    save_dir = str(tmp_path)
+    characters = [make_character(f"hero_{number}", level=number + 1) for number in range(150)]
+    character_manager.save_characters(characters, save_dir)
+    (tmp_path / "Broken_save.txt").write_text("NAME: Broken\nCLASS: Mage\nLEVEL: high\n")
+    character_manager.save_character(make_character("Torn"), save_dir)
+    torn = tmp_path / "Torn_save.txt"
+    torn.write_bytes(torn.read_bytes().replace(b"LEVEL: 1", b"LEVEL: 7"))
+
+    results = list(character_manager.load_all_characters(save_dir, workers=3, mode=mode))
+    loaded = {name: character for name, character, error in results if error is None}
+    errors = {name: type(error) for name, _, error in results if error is not None}
+
+    assert len(results) == 152
+    assert loaded["hero_42"] == characters[42]
+    assert errors == {"Broken": InvalidSaveDataError, "Torn": SaveFileCorruptedError}
+
+def test_load_all_characters_with_sqlite_processes(tmp_path, sqlite_backend):
+    """Test process-mode loading with the SQLite backend"""
+    save_dir = str(tmp_path)
+    sqlite_backend.save_many([make_character(f"hero_{number}") for number in range(10)], save_dir)
+    names = sorted(name for name, _, _ in character_manager.load_all_characters(save_dir, workers=2, mode="process"))
+    assert names == sorted(f"hero_{number}" for number in range(10))
+
+def test_load_all_characters_validates_immediately(tmp_path):
+    """Test that bad arguments raise ValueError on the call, before iterating"""
+    save_dir = str(tmp_path)
+    with pytest.raises(ValueError):
+        character_manager.load_all_characters(save_dir, mode="fiber")
+    with pytest.raises(ValueError):
+        character_manager.load_all_characters(save_dir, workers=0)